@@ -1,6 +1,11 @@
+from pathlib import Path
+
 import pkg_resources
 import toml
 
+# Comparators whose version is the oldest one allowed by the requirement.
+PINNING_COMPARATORS = {"==", ">=", "~="}
+
 project = toml.load("pyproject.toml")["project"]
 requirements = [pkg_resources.Requirement(pkg) for pkg in project["dependencies"]]
 
@@ -10,22 +15,24 @@ for requirement in requirements:
     dependency = requirement.project_name
     if requirement.extras:
         dependency += "[" + ",".join(requirement.extras) + "]"
-    for comparator, version in requirement.specs:
-        if (
-            comparator == "<="
-            and len(requirement.specs) != 2
-            or comparator != "<="
-            and comparator == "=="
-            and len(requirement.specs) != 1
-        ):
-            raise ValueError(f"Invalid dependency: {requirement}")
-        elif comparator != "<=" and comparator in ["==", ">=", "~="]:
-            dependency += f"=={version}"
+
+    comparators = [comparator for comparator, _ in requirement.specs]
+    pins = [
+        version
+        for comparator, version in requirement.specs
+        if comparator in PINNING_COMPARATORS
+    ]
+    if (
+        len(pins) > 1
+        or ("==" in comparators and len(comparators) != 1)
+        or ("<=" in comparators and len(comparators) != 2)
+    ):
+        raise ValueError(f"Invalid dependency: {requirement}")
+
+    if pins:
+        dependency += f"=={pins[0]}"
     oldest_dependencies.append(dependency)
 
-for dependency in oldest_dependencies:
-    print(dependency)
+print("\n".join(oldest_dependencies))
 
-with open("oldest_requirements.txt", "w") as f:
-    for dependency in oldest_dependencies:
-        f.write(f"{dependency}\n")
+Path("oldest_requirements.txt").write_text("\n".join(oldest_dependencies) + "\n")
@@ -19,6 +19,7 @@ from scipy.sparse.linalg import bicgstab as _bicgstab
 from scipy.sparse.linalg import LinearOperator as _LinearOperator
 
 from .operator import AbstractOperator as _AbstractOperator
+from .utils import mpi as _mpi
 from jax.experimental.sparse import JAXSparse as _JAXSparse
 
 
@@ -29,10 +30,34 @@ def lanczos_ed(
     compute_eigenvectors: bool = False,
     matrix_free: bool = False,
     scipy_args: Optional[dict] = None,
+    method: str = "arpack",
+    sigma: Optional[float] = None,
+    preconditioner: Optional[_LinearOperator] = None,
+    distributed: bool = False,
 ):
     r"""Computes `first_n` smallest eigenvalues and, optionally, eigenvectors
     of a Hermitian operator using :meth:`scipy.sparse.linalg.eigsh`.
 
+    Alternatively, by specifying `method="lobpcg"`, the eigenpairs are computed with
+    :meth:`scipy.sparse.linalg.lobpcg`, which applies the operator to a whole block
+    of vectors at once and accepts a `preconditioner` approximating :math:`H^{-1}`.
+    Without a good preconditioner ARPACK usually needs fewer operator applications
+    and is faster. LOBPCG can be preferable when a good preconditioner is known, or
+    when applying the operator to a block of vectors costs much less than applying
+    it to every vector separately.
+
+    If `distributed=True` and several MPI ranks are active, ARPACK is run on every
+    rank, but every rank builds only a contiguous block of rows of the sparse matrix
+    and the matrix-vector products are computed in parallel. Every product is a
+    collective operation, so all ranks must call this function with the same
+    arguments.
+
+    If a shift `sigma` is specified, ARPACK is run in shift-invert mode and the `k`
+    eigenvalues closest to `sigma` are computed instead of the smallest ones. ARPACK
+    then works with the largest eigenvalues of :math:`(H - \sigma I)^{-1}`, which
+    usually converges in far fewer iterations, in particular when `sigma` is chosen
+    close to the target eigenvalue (e.g. slightly below the ground-state energy).
+
     Args:
         operator: NetKet operator to diagonalize.
         k: The number of eigenvalues to compute.
@@ -43,7 +68,25 @@ def lanczos_ed(
             Otherwise, the operator is first converted to a sparse matrix.
         scipy_args: Additional keyword arguments passed to
             :meth:`scipy.sparse.linalg.eigvalsh`. See the Scipy documentation for further
-            information.
+            information. If `method="lobpcg"`, the accepted arguments are
+            `tol` (default 1e-8), `maxiter` (default 1000), `block_size`
+            (default `k + 2`) and `seed` (default None) of the random initial
+            block, and :class:`scipy.sparse.linalg.ArpackNoConvergence` is raised
+            if the eigenpairs do not converge.
+        method: The eigensolver to use, either `"arpack"` (default) or
+            `"lobpcg"`.
+        sigma: If specified, find the eigenvalues closest to `sigma` using the
+            shift-invert mode of ARPACK. For sparse matrices, the shifted operator is
+            factorized with SuperLU, while for matrix-free operators the linear
+            systems :math:`(H - \sigma I)x = b` are solved with GMRES.
+        preconditioner: Optional preconditioner approximating
+            :math:`(H - \sigma I)^{-1}`, used by GMRES when `sigma` is specified
+            and the operator is matrix-free. With `method="lobpcg"`, it should
+            approximate :math:`H^{-1}` and is passed to LOBPCG.
+        distributed: If True and several MPI ranks are active, distribute the rows
+            of the sparse matrix and the matrix-vector products among the ranks
+            (default: False). Not supported together with `matrix_free`, `sigma`
+            or `method="lobpcg"`.
 
     Returns:
         Either `w` or the tuple `(w, v)` depending on whether `compute_eigenvectors`
@@ -65,33 +108,253 @@ def lanczos_ed(
     """
     from scipy.sparse.linalg import eigsh
 
-    actual_scipy_args = {}
-    if scipy_args:
-        actual_scipy_args.update(scipy_args)
-    actual_scipy_args["which"] = "SA"
-    actual_scipy_args["k"] = k
-    actual_scipy_args["return_eigenvectors"] = compute_eigenvectors
+    from scipy.sparse import issparse
+
+    if method not in ("arpack", "lobpcg"):
+        raise ValueError("method must be 'arpack' or 'lobpcg'")
+    if sigma is not None and method != "arpack":
+        raise ValueError("sigma is only supported by method='arpack'")
+    if distributed and (matrix_free or sigma is not None or method != "arpack"):
+        raise ValueError(
+            "distributed=True is only supported by method='arpack' with a sparse "
+            "matrix and without sigma"
+        )
+    distributed = distributed and _mpi.n_nodes > 1
 
     if matrix_free:
         # wrap the operator.to_linear_operator() in a scipy.sparse.linalg.LinearOperator
         n = operator.hilbert.n_states
+        linear_op = operator.to_linear_operator()
         A = _LinearOperator(
             (n, n),
-            operator.to_linear_operator().__matmul__,
+            linear_op.__matmul__,
+            matmat=linear_op.__matmul__,
             dtype=operator.dtype,
         )
+    elif distributed:
+        A = _mpi_row_distributed_operator(operator)
     else:
         A = operator.to_sparse()
         if isinstance(A, _JAXSparse):
-            # jax sparse arrays are not compatible with scipy eigsh.
-            # wrap them in a scipy.sparse.linalg.LinearOperator
-            A = _LinearOperator(A.shape, A.__matmul__, dtype=A.dtype)
+            # jax sparse arrays are not compatible with scipy eigsh, and
+            # dispatching every matrix-vector product to jax is slow.
+            A = _jax_sparse_to_scipy(A)
+
+    if method == "lobpcg":
+        return _lobpcg_eigsh(
+            A,
+            k=k,
+            compute_eigenvectors=compute_eigenvectors,
+            preconditioner=preconditioner,
+            **(scipy_args or {}),
+        )
+
+    actual_scipy_args = {}
+    if scipy_args:
+        actual_scipy_args.update(scipy_args)
+    actual_scipy_args["which"] = "SA"
+    actual_scipy_args["k"] = k
+    actual_scipy_args["return_eigenvectors"] = compute_eigenvectors
+
+    if sigma is not None:
+        actual_scipy_args["sigma"] = sigma
+        actual_scipy_args["which"] = "LM"
+        if not issparse(A):
+            # scipy would solve the shifted systems without preconditioning
+            actual_scipy_args["OPinv"] = _shift_invert_operator(
+                A, sigma, preconditioner
+            )
+
+        result = eigsh(A, **actual_scipy_args)
+
+        # in shift-invert mode the eigenvalues are not sorted
+        if compute_eigenvectors:
+            w, v = result
+            idx = _np.argsort(w)
+            return w[idx], v[:, idx]
+        return _np.sort(result)
+
+    if distributed:
+        # Every rank runs ARPACK, but the matrix-vector products are distributed.
+        # ARPACK follows the same path on all ranks only if it starts from the
+        # same vector.
+        if actual_scipy_args.get("v0") is None:
+            v0 = _np.random.default_rng().standard_normal(A.shape[0])
+            actual_scipy_args["v0"] = _mpi.mpi_bcast(v0, root=0)
 
     result = eigsh(A, **actual_scipy_args)
 
     return result[::-1] if not compute_eigenvectors else result
 
 
+def _jax_sparse_to_scipy(A):
+    """
+    Converts a 2D jax sparse matrix to a scipy CSR matrix, summing the duplicate
+    entries and dropping the explicit zeros.
+    """
+    from scipy.sparse import coo_matrix
+
+    bcoo = A.to_bcoo() if hasattr(A, "to_bcoo") else A
+    indices = _np.asarray(bcoo.indices)
+    data = _np.asarray(bcoo.data)
+
+    A = coo_matrix(
+        (data, (indices[:, 0], indices[:, 1])), shape=bcoo.shape, dtype=data.dtype
+    ).tocsr()
+    A.eliminate_zeros()
+    return A
+
+
+def _mpi_row_distributed_operator(operator):
+    """
+    Returns a LinearOperator computing the product with the sparse matrix of
+    `operator`, where every MPI rank builds and multiplies only a contiguous block
+    of rows, and the result is then gathered on all ranks.
+    """
+    n = operator.hilbert.n_states
+    row_counts = _np.full(_mpi.n_nodes, n // _mpi.n_nodes)
+    row_counts[: n % _mpi.n_nodes] += 1
+    row_offsets = _np.concatenate([[0], _np.cumsum(row_counts)])
+
+    A_local = _sparse_rows(operator, row_offsets[_mpi.rank], row_offsets[_mpi.rank + 1])
+    dtype = _np.promote_types(A_local.dtype, _np.float64)
+
+    def matvec(x):
+        y_local = _np.ascontiguousarray(A_local @ x.reshape(-1), dtype=dtype)
+        y = _np.empty(n, dtype=dtype)
+        _mpi.MPI_py_comm.Allgatherv(y_local, [y, (row_counts, row_offsets[:-1])])
+        return y
+
+    return _LinearOperator((n, n), matvec, dtype=dtype)
+
+
+def _sparse_rows(operator, start, stop, chunk_size=4096):
+    """
+    Returns the rows `start:stop` of the sparse matrix of `operator` as a scipy CSR
+    matrix, without building the other rows. The connected elements are computed
+    for chunks of `chunk_size` basis states at a time.
+    """
+    from scipy.sparse import coo_matrix, vstack
+
+    operator = operator.collect()
+    hilb = operator.hilbert
+    n = hilb.n_states
+
+    blocks = [coo_matrix((0, n), dtype=operator.dtype)]
+    for i in range(start, stop, chunk_size):
+        x = hilb.numbers_to_states(_np.arange(i, min(i + chunk_size, stop)))
+        xp, mels = operator.get_conn_padded(x)
+        mels = _np.asarray(mels)
+        rows = _np.broadcast_to(_np.arange(x.shape[0])[:, None], mels.shape)
+        # the padding states may not satisfy the constraints of the hilbert space
+        nonzero = mels != 0
+        mels = mels[nonzero]
+        rows = rows[nonzero]
+        cols = hilb.states_to_numbers(_np.asarray(xp)[nonzero])
+        blocks.append(coo_matrix((mels, (rows, cols)), shape=(x.shape[0], n)))
+
+    A = vstack(blocks, format="csr")
+    A.eliminate_zeros()
+    return A
+
+
+def _shift_invert_operator(A, sigma, preconditioner=None, tol=1e-12):
+    r"""
+    Returns a LinearOperator applying :math:`(A - \sigma I)^{-1}` by solving the
+    linear system with GMRES, optionally preconditioned by `preconditioner`.
+    """
+    import inspect
+    from scipy.sparse import identity
+    from scipy.sparse.linalg import gmres, aslinearoperator
+
+    A_shifted = aslinearoperator(A) - sigma * aslinearoperator(
+        identity(A.shape[0], dtype=A.dtype)
+    )
+
+    # scipy 1.12 renamed the relative tolerance `tol` to `rtol`
+    tol_name = "rtol" if "rtol" in inspect.signature(gmres).parameters else "tol"
+
+    def matvec(b):
+        x, info = gmres(A_shifted, b, M=preconditioner, atol=0.0, **{tol_name: tol})
+        if info != 0:
+            raise RuntimeError(
+                f"GMRES failed to converge in shift-invert mode (info={info})."
+            )
+        return x
+
+    return _LinearOperator(A.shape, matvec, dtype=A.dtype)
+
+
+def _lobpcg_eigsh(
+    A,
+    *,
+    k: int,
+    compute_eigenvectors: bool,
+    preconditioner: Optional[_LinearOperator] = None,
+    tol: float = 1e-8,
+    maxiter: int = 1000,
+    block_size: Optional[int] = None,
+    seed: Optional[int] = None,
+):
+    """
+    Computes the `k` smallest eigenpairs of the Hermitian matrix or linear operator
+    `A` with LOBPCG, starting from a random block of `block_size` vectors
+    (default: `k + 2`).
+
+    Like ARPACK, raises :class:`scipy.sparse.linalg.ArpackNoConvergence` if the
+    eigenpairs have not converged after `maxiter` iterations.
+    """
+    import warnings
+    from scipy.sparse.linalg import lobpcg, ArpackNoConvergence
+
+    n = A.shape[0]
+    if block_size is None:
+        block_size = k + 2
+    if block_size < k:
+        raise ValueError("block_size must be at least k")
+    n_vecs = min(block_size, n)
+    dtype = _np.promote_types(A.dtype, _np.float64)
+
+    rng = _np.random.default_rng(seed)
+    X = rng.standard_normal((n, n_vecs))
+    if _np.issubdtype(dtype, _np.complexfloating):
+        X = X + 1j * rng.standard_normal((n, n_vecs))
+
+    # LOBPCG updates the products in place, so they must be numpy arrays
+    def matmat(X):
+        return _np.asarray(A @ X)
+
+    op = _LinearOperator(A.shape, matvec=matmat, matmat=matmat, dtype=A.dtype)
+
+    with warnings.catch_warnings():
+        # the convergence is checked below
+        warnings.filterwarnings(
+            "ignore", message="(?s).*not reaching the requested tolerance"
+        )
+        w, v = lobpcg(
+            op,
+            X.astype(dtype),
+            M=preconditioner,
+            largest=False,
+            tol=tol,
+            maxiter=maxiter,
+        )
+
+    idx = _np.argsort(w)[:k]
+    w, v = w[idx], v[:, idx]
+
+    residuals = _np.linalg.norm(op @ v - v * w, axis=0)
+    if not _np.all(residuals <= tol * _np.maximum(1.0, _np.abs(w))):
+        raise ArpackNoConvergence(
+            f"LOBPCG did not converge after {maxiter} iterations "
+            f"(residuals: {residuals}).",
+            w,
+            v,
+        )
+
+    return (w, v) if compute_eigenvectors else w
+
+
 def full_ed(operator: _AbstractOperator, *, compute_eigenvectors: bool = False):
     """Computes all eigenvalues and, optionally, eigenvectors
     of a Hermitian operator by full diagonalization.
@@ -116,11 +379,15 @@ def full_ed(operator: _AbstractOperator, *, compute_eigenvectors: bool = False):
         >>> w.shape
         (256,)
     """
-    from numpy.linalg import eigh, eigvalsh
+    from scipy.linalg import eigh, eigvalsh
 
-    dense_op = operator.to_dense()
+    dense_op = _np.asarray(operator.to_dense())
 
-    return eigh(dense_op) if compute_eigenvectors else eigvalsh(dense_op)
+    # dense_op is a temporary, so LAPACK is allowed to overwrite it instead of
+    # working on a copy.
+    if compute_eigenvectors:
+        return eigh(dense_op, driver="evr", overwrite_a=True, check_finite=False)
+    return eigvalsh(dense_op, driver="evr", overwrite_a=True, check_finite=False)
 
 
 def steady_state(lindblad, *, sparse=True, method="ed", rho0=None, **kwargs):
@@ -142,7 +409,11 @@ def steady_state(lindblad, *, sparse=True, method="ed", rho0=None, **kwargs):
             iterative)
         method: 'ed' (exact diagonalization) or 'iterative' (iterative bicgstabl)
         rho0: starting density matrix for the iterative diagonalization (default: None)
-        kwargs...: additional kwargs passed to bicgstabl
+        kwargs...: additional kwargs passed to bicgstabl. If `sparse=True` and no
+            preconditioner `M` is specified, an incomplete LU factorization of the
+            lindbladian is used as preconditioner. The last few factorizations are
+            kept in memory and reused for close lindbladians, and can be released
+            with :func:`~netket.exact.clear_steady_state_cache`.
 
     For full docs please consult SciPy documentation at
     https://docs.scipy.org/doc/scipy/reference/generated/scipy.sparse.linalg.bicgstab.html
@@ -161,31 +432,45 @@ def steady_state(lindblad, *, sparse=True, method="ed", rho0=None, **kwargs):
     if method == "ed":
         if not sparse:
             from numpy.linalg import eigh
-            from warnings import warn
-
-            warn(
-                """For reasons unknown to me, using dense diagonalisation on this
-                matrix results in very low precision of the resulting steady-state
-                since the update to numpy 1.9.
-                We suggest using sparse=True, however, if you wish not to, you have
-                been warned.
-                Your digits are your responsibility now.
-                """,
-                stacklevel=2,
-            )
 
             lind_mat = lindblad.to_dense()
 
-            ldagl = lind_mat.T.conj() * lind_mat
+            ldagl = lind_mat.T.conj() @ lind_mat
             w, v = eigh(ldagl)
 
         else:
-            from scipy.sparse.linalg import eigsh
+            from scipy.sparse import identity
+            from scipy.sparse.linalg import eigsh, splu
 
             lind_mat = lindblad.to_sparse()
-            ldagl = lind_mat.T.conj() * lind_mat
+            lind_mat_h = lind_mat.T.conj().tocsr()
+
+            # products with L^† L are applied as L^† (L x), which is cheaper than
+            # multiplying by the usually much denser L^† L
+            ldagl = _LinearOperator(
+                lind_mat.shape,
+                matvec=lambda x: lind_mat_h @ (lind_mat @ x),
+                dtype=lind_mat.dtype,
+            )
+
+            # L always has the steady state in its kernel and can't be factorized.
+            # The shift-invert around 0, which converges in much fewer iterations
+            # than which="SM", is performed instead around the small negative shift
+            # -eps, where L^† L + eps I is positive definite.
+            ldagl_mat = (lind_mat_h @ lind_mat).tocsc()
+            eps = 1e-10 * _np.abs(ldagl_mat.diagonal()).max()
+            ldagl_lu = splu(
+                ldagl_mat + eps * identity(ldagl_mat.shape[0], format="csc")
+            )
+            ldagl_inv = _LinearOperator(
+                lind_mat.shape, matvec=ldagl_lu.solve, dtype=lind_mat.dtype
+            )
+            w, v = eigsh(ldagl, k=2, sigma=-eps, which="LM", OPinv=ldagl_inv)
 
-            w, v = eigsh(ldagl, which="SM", k=2)
+            # The eigenvalues close to 0 are dominated by round-off, so the steady
+            # state is selected as the eigenvector with the smallest residual |L v|.
+            idx = _np.argsort(_np.linalg.norm(lind_mat @ v, axis=0))
+            w, v = w[idx], v[:, idx]
 
         print("Minimum eigenvalue is: ", w[0])
         rho = v[:, 0].reshape((M, M))
@@ -195,7 +480,14 @@ def steady_state(lindblad, *, sparse=True, method="ed", rho0=None, **kwargs):
         # An extra row is added at the bottom of the therefore M^2+1 long array,
         # with the trace of the density matrix. This is needed to enforce the
         # trace-1 condition.
-        L = lindblad.to_linear_operator(sparse=sparse, append_trace=True)
+        if sparse and "M" not in kwargs:
+            # the sparse lindbladian is built once, for both the preconditioner and
+            # the solver
+            lind_mat = lindblad.to_sparse()
+            kwargs["M"] = _lindblad_ilu_preconditioner(lind_mat, M)
+            L = _append_trace_row(lind_mat, M)
+        else:
+            L = lindblad.to_linear_operator(sparse=sparse, append_trace=True)
 
         # Initial density matrix ( + trace condition)
         Lrho_start = _np.zeros((M**2 + 1), dtype=L.dtype)
@@ -226,3 +518,103 @@ def steady_state(lindblad, *, sparse=True, method="ed", rho0=None, **kwargs):
         raise ValueError("method must be 'ed' or 'iterative'")
 
     return rho
+
+
+_lindblad_ilu_cache = {}
+"""Cache of the ILU preconditioners, keyed by the sparsity pattern of the lindbladian.
+It is emptied by :func:`clear_steady_state_cache`."""
+
+_lindblad_ilu_cache_size = 4
+"""Maximum number of preconditioners kept in `_lindblad_ilu_cache`."""
+
+_lindblad_ilu_cache_rtol = 1e-2
+"""Relative distance below which a cached preconditioner is reused for a new lindbladian."""
+
+
+def clear_steady_state_cache():
+    """
+    Releases the incomplete LU factorizations of the lindbladians cached by
+    :func:`~netket.exact.steady_state` with `method="iterative"`, which for large
+    systems can take a sizeable amount of memory.
+    """
+    _lindblad_ilu_cache.clear()
+
+
+def _append_trace_row(lind_mat, M):
+    """
+    Returns the sparse lindbladian `lind_mat` acting on the M^2+1 long vectors used
+    by the iterative solver, whose last row is the trace of the density matrix.
+    """
+    from scipy.sparse import bmat, csr_matrix
+
+    diag_idx = _np.arange(M) * (M + 1)
+    trace_row = csr_matrix(
+        (_np.ones(M), (_np.zeros(M), diag_idx)),
+        shape=(1, M**2),
+        dtype=lind_mat.dtype,
+    )
+    zero_col = csr_matrix((M**2, 1), dtype=lind_mat.dtype)
+    return bmat([[lind_mat, zero_col], [trace_row, None]], format="csr")
+
+
+def _lindblad_ilu_preconditioner(lind_mat, M):
+    """
+    Returns a preconditioner for the sparse lindbladian `lind_mat` with the appended
+    trace row, or None if its construction fails.
+
+    The lindbladian with the appended trace row has a zero column, and can't be
+    factorized. The preconditioner is instead the incomplete LU factorization of the
+    bordered matrix [[L, vec(I)], [Tr, 0]], which is non-singular when the steady
+    state is unique and has the same solution.
+
+    The factorization is cached on the sparsity pattern of the lindbladian, together
+    with the values it was computed for. It is reused only if the new lindbladian is
+    within a relative distance `_lindblad_ilu_cache_rtol` of those values, so that small
+    steps when sweeping the parameters of the master equation do not refactorize it.
+    """
+    lind_mat = lind_mat.tocsr()
+    lind_mat.sum_duplicates()
+    # the key stores the full sparsity pattern, as hashes alone may collide
+    key = (
+        lind_mat.shape,
+        lind_mat.indptr.tobytes(),
+        lind_mat.indices.tobytes(),
+    )
+
+    cached = _lindblad_ilu_cache.get(key)
+    if cached is not None:
+        cached_data, preconditioner = cached
+        distance = _np.linalg.norm(lind_mat.data - cached_data)
+        if distance <= _lindblad_ilu_cache_rtol * _np.linalg.norm(cached_data):
+            return preconditioner
+
+    preconditioner = _bordered_ilu_preconditioner(lind_mat, M)
+    if preconditioner is not None:
+        _lindblad_ilu_cache.pop(key, None)
+        if len(_lindblad_ilu_cache) >= _lindblad_ilu_cache_size:
+            # evict the oldest preconditioner
+            del _lindblad_ilu_cache[next(iter(_lindblad_ilu_cache))]
+        _lindblad_ilu_cache[key] = (lind_mat.data.copy(), preconditioner)
+    return preconditioner
+
+
+def _bordered_ilu_preconditioner(lind_mat, M):
+    from scipy.sparse import bmat, csr_matrix
+    from scipy.sparse.linalg import spilu
+
+    diag_idx = _np.arange(M) * (M + 1)
+    trace_row = csr_matrix(
+        (_np.ones(M), (_np.zeros(M), diag_idx)),
+        shape=(1, M**2),
+        dtype=lind_mat.dtype,
+    )
+    bordered = bmat([[lind_mat, trace_row.T], [trace_row, None]], format="csc")
+
+    try:
+        bordered_ilu = spilu(bordered, drop_tol=1e-4, fill_factor=10)
+    except RuntimeError:
+        return None
+
+    return _LinearOperator(
+        bordered.shape, matvec=bordered_ilu.solve, dtype=lind_mat.dtype
+    )
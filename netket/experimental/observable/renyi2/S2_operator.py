@@ -94,7 +94,8 @@ class Renyi2EntanglementEntropy(AbstractObservable):
 
         super().__init__(hilbert)
 
-        self._partition = np.array(list(set(partition)))
+        # sorted and without duplicates, as required to compute partial traces
+        self._partition = np.unique(np.asarray(partition))
 
         if (
             np.where(self._partition < 0)[0].size > 0
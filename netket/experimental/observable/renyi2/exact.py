@@ -25,20 +25,26 @@ def Renyi2(vstate: FullSumState, op: Renyi2EntanglementEntropy):
     if op.hilbert != vstate.hilbert:
         raise TypeError("Hilbert spaces should match")
 
-    state_qutip = vstate.to_qobj()
-
     N = vstate.hilbert.size
 
     if len(op.partition) in [N, 0]:
         out = 0
     else:
-        mask = np.zeros(N, dtype=bool)
-        mask[op.partition] = True
+        # The amplitudes are reshaped into a matrix A with the sites of the partition
+        # as rows, such that ρ = A A^†. Then Tr[ρ^2] = ||A A^†||^2 = ||A^† A||^2, and
+        # the smaller of the two Gram matrices is computed.
+        psi = np.asarray(vstate.to_array()).reshape(vstate.hilbert.shape)
+        partition = tuple(op.partition)
+        complement = tuple(i for i in range(N) if i not in set(partition))
+
+        dim_partition = np.prod([vstate.hilbert.shape[i] for i in partition])
+        A = np.transpose(psi, partition + complement).reshape(dim_partition, -1)
+        gram = A @ A.conj().T if A.shape[0] <= A.shape[1] else A.conj().T @ A
 
-        rdm = state_qutip.ptrace(np.arange(N)[mask])
+        tr_rho2 = np.vdot(gram, gram)
 
         n = 2
-        out = np.log2(np.trace(np.linalg.matrix_power(rdm, n))) / (1 - n)
-        out = np.absolute(out.real)
+        out = np.log2(tr_rho2.real) / (1 - n)
+        out = np.absolute(out)
 
     return Stats(mean=out, error_of_mean=0.0, variance=0.0)
@@ -15,12 +15,12 @@
 from typing import Optional, Union
 from collections.abc import Iterator
 from textwrap import dedent
-from functools import reduce
+from functools import lru_cache
+import math
 
 import numpy as np
 
-from netket.utils.types import Array
-from netket.utils.numbers import is_scalar
+from netket.utils.types import Array, DType
 from netket.errors import HilbertIndexingDuringTracingError, concrete_or_error
 
 from .abstract_hilbert import AbstractHilbert
@@ -29,13 +29,16 @@ max_states = np.iinfo(np.int32).max
 """int: Maximum number of states that can be indexed"""
 
 
-def _is_indexable(shape):
+_log_max_states = math.log(max_states)
+
+
+@lru_cache(maxsize=1024)
+def _is_indexable(shape: tuple[int, ...]) -> bool:
     """
     Returns whether a discrete Hilbert space of shape `shape` is
     indexable (i.e., its total number of states is below the maximum).
     """
-    log_max = np.log(max_states)
-    return np.sum(np.log(shape)) <= log_max
+    return sum(math.log(s) for s in shape) <= _log_max_states
 
 
 class DiscreteHilbert(AbstractHilbert):
@@ -151,17 +154,18 @@ class DiscreteHilbert(AbstractHilbert):
         numbers = concrete_or_error(
             np.asarray, numbers, HilbertIndexingDuringTracingError
         )
+        scalar = numbers.ndim == 0
+        if scalar:
+            numbers = numbers.reshape(1)
 
         if out is None:
-            out = np.empty((np.atleast_1d(numbers).shape[0], self.size))
+            out = np.empty((numbers.shape[0], self.size))
 
-        if np.any(numbers >= self.n_states):
+        if numbers.max(initial=-1) >= self.n_states:
             raise ValueError("numbers outside the range of allowed states")
 
-        if is_scalar(numbers):
-            return self._numbers_to_states(np.atleast_1d(numbers), out=out)[0, :]
-        else:
-            return self._numbers_to_states(numbers, out=out)
+        out = self._numbers_to_states(numbers, out=out)
+        return out[0, :] if scalar else out
 
     def states_to_numbers(
         self, states: np.ndarray, out: Optional[np.ndarray] = None
@@ -198,31 +202,78 @@ class DiscreteHilbert(AbstractHilbert):
 
         return out[0] if states.ndim == 1 else out.reshape(states.shape[:-1])
 
-    def states(self) -> Iterator[np.ndarray]:
+    def states(self, chunk_size: int = 4096) -> Iterator[np.ndarray]:
         r"""Returns an iterator over all valid configurations of the Hilbert space.
         Throws an exception iff the space is not indexable.
         Iterating over all states with this method is typically inefficient,
         and ```all_states``` should be preferred.
 
+        Args:
+            chunk_size: The number of states that are converted at once.
         """
-        for i in range(self.n_states):
-            yield self.numbers_to_states(i).reshape(-1)
-
-    def all_states(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        n_states = self.n_states
+        for start in range(0, n_states, chunk_size):
+            numbers = np.arange(start, min(start + chunk_size, n_states))
+            yield from self.numbers_to_states(numbers)
+
+    def all_states(
+        self,
+        out: Optional[np.ndarray] = None,
+        chunk_size: int = 65536,
+        *,
+        dtype: Optional[DType] = None,
+    ) -> np.ndarray:
         r"""Returns all valid states of the Hilbert space.
 
         Throws an exception if the space is not indexable.
 
         Args:
             out: an optional pre-allocated output array
+            chunk_size: The number of states that are converted at once.
+            dtype: The dtype of the output array, if it is not pre-allocated
+                (default: float64). A small integer dtype such as `np.int8` reduces
+                the memory required, provided it can represent all local states.
 
         Returns:
             A (n_states x size) batch of states. this corresponds
             to the pre-allocated array if it was passed.
         """
-        numbers = np.arange(0, self.n_states, dtype=np.int64)
-
-        return self.numbers_to_states(numbers, out)
+        n_states = self.n_states
+        if out is None:
+            out = self._empty_states(n_states, dtype)
+
+        # the conversion kernels only write float64 arrays, so other dtypes are
+        # converted chunk by chunk through a small buffer.
+        if out.dtype != np.float64:
+            buffer = np.empty((min(chunk_size, n_states), self.size))
+
+        for start in range(0, n_states, chunk_size):
+            stop = min(start + chunk_size, n_states)
+            numbers = np.arange(start, stop, dtype=np.int64)
+            if out.dtype == np.float64:
+                out[start:stop] = self._numbers_to_states(numbers, out=out[start:stop])
+            else:
+                out[start:stop] = self._numbers_to_states(
+                    numbers, out=buffer[: stop - start]
+                )
+
+        return out
+
+    def _empty_states(self, n: int, dtype: Optional[DType] = None) -> np.ndarray:
+        """
+        Allocates an array for `n` states with the given dtype, after checking that
+        the dtype can represent all the local states.
+        """
+        dtype = np.dtype(np.float64 if dtype is None else dtype)
+        if not np.issubdtype(dtype, np.floating):
+            for i in range(self.size):
+                local_states = np.asarray(self.states_at_index(i))
+                if not np.array_equal(local_states.astype(dtype), local_states):
+                    raise ValueError(
+                        f"The local states at site {i} cannot be represented "
+                        f"with dtype {dtype}."
+                    )
+        return np.empty((n, self.size), dtype=dtype)
 
     def states_to_local_indices(self, x: Array):
         r"""Returns a tensor with the same shape of `x`, where all local
@@ -269,4 +320,17 @@ class DiscreteHilbert(AbstractHilbert):
         return NotImplemented
 
     def __pow__(self, n):
-        return reduce(lambda x, y: x * y, [self for _ in range(n)])
+        if n < 1:
+            raise ValueError("The exponent must be a positive integer.")
+
+        # Exponentiation by squaring, which builds the product with O(log(n))
+        # multiplications instead of folding n factors one at a time.
+        result = None
+        base = self
+        while n > 0:
+            if n % 2 == 1:
+                result = base if result is None else result * base
+            n //= 2
+            if n > 0:
+                base = base * base
+        return result
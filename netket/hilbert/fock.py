@@ -13,12 +13,11 @@
 # limitations under the License.
 
 from typing import Optional, Union
-from functools import partial
 
 import numpy as np
-from numba import jit
 
 from .homogeneous import HomogeneousHilbert
+from .index import SumConstraint
 
 FOCK_MAX = np.iinfo(np.intp).max - 1
 """
@@ -28,11 +27,6 @@ and it would overflow.
 """
 
 
-@jit(nopython=True)
-def _sum_constraint(x, n_particles):
-    return np.sum(x, axis=1) == n_particles
-
-
 class Fock(HomogeneousHilbert):
     r"""Hilbert space obtained as tensor product of local fock basis."""
 
@@ -86,7 +80,7 @@ class Fock(HomogeneousHilbert):
                         with the given n_max."""
                 )
 
-            constraints = partial(_sum_constraint, n_particles=n_particles)
+            constraints = SumConstraint(n_particles)
 
         else:
             constraints = None
@@ -13,13 +13,95 @@
 # limitations under the License.
 
 from typing import Optional, Callable
+from functools import lru_cache
+import weakref
 
 from numbers import Real
 
 import numpy as np
 
-from .discrete_hilbert import DiscreteHilbert
-from .index import HilbertIndex, UnconstrainedHilbertIndex, ConstrainedHilbertIndex
+from netket.utils.types import DType
+
+from .discrete_hilbert import DiscreteHilbert, max_states
+from .index import (
+    HilbertIndex,
+    UnconstrainedHilbertIndex,
+    ConstrainedHilbertIndex,
+    CombinadicHilbertIndex,
+    SumConstraint,
+)
+from .index.unconstrained import _all_states_kernel, _numbers_to_states_kernel
+
+
+def _binary_numbers_to_states(numbers, local_states, out):
+    """
+    Converts numbers to states of an unconstrained hilbert space with 2 local
+    states and at most 63 sites by unpacking the bits of the numbers.
+    """
+    size = out.shape[1]
+    numbers = np.asarray(numbers, dtype=np.uint64) << np.uint64(64 - size)
+    numbers_be = numbers.astype(">u8").view(np.uint8)
+    bits = np.unpackbits(numbers_be.reshape(-1, 8), axis=1, count=size)
+    out[...] = local_states[bits]
+    return out
+
+
+def _binary_states_to_numbers(states, local_states, out):
+    """
+    Converts states of an unconstrained hilbert space with 2 local states and
+    at most 63 sites to numbers by packing the bits of the states.
+    """
+    size = states.shape[1]
+    packed = np.packbits(states > local_states[0], axis=1)
+    numbers_be = np.zeros((states.shape[0], 8), dtype=np.uint8)
+    numbers_be[:, : packed.shape[1]] = packed
+    out[...] = numbers_be.view(">u8").reshape(-1) >> np.uint64(64 - size)
+    return out
+
+
+def _build_hilbert_index(
+    local_states: tuple[float, ...], size: int, constraint_fn: Optional[Callable]
+) -> HilbertIndex:
+    local_states = np.asarray(local_states, dtype=np.float64)
+    if isinstance(constraint_fn, SumConstraint) and np.array_equal(
+        local_states, np.round(local_states)
+    ):
+        # states with a fixed sum of integer local states are ranked directly,
+        # without enumerating the unconstrained space.
+        return CombinadicHilbertIndex(local_states, size, constraint_fn.total)
+    elif constraint_fn is not None:
+        return ConstrainedHilbertIndex(local_states, size, constraint_fn)
+    else:
+        return UnconstrainedHilbertIndex(local_states, size)
+
+
+# Equivalent hilbert spaces share the same index, which is expensive to construct.
+# The indices of the built-in constraints are cached with a bounded lru cache.
+_cached_builtin_hilbert_index = lru_cache(maxsize=128)(_build_hilbert_index)
+
+# The indices of user-defined constraints, which can hold large tables of states,
+# are only referenced weakly, and are dropped from the cache together with their
+# constraint when no hilbert space is using them anymore.
+_constrained_hilbert_index_cache = weakref.WeakValueDictionary()
+
+
+def _cached_hilbert_index(
+    local_states: tuple[float, ...], size: int, constraint_fn: Optional[Callable]
+) -> HilbertIndex:
+    if constraint_fn is None or isinstance(constraint_fn, SumConstraint):
+        return _cached_builtin_hilbert_index(local_states, size, constraint_fn)
+
+    key = (local_states, size, constraint_fn)
+    index = _constrained_hilbert_index_cache.get(key)
+    if index is None:
+        index = _build_hilbert_index(local_states, size, constraint_fn)
+        _constrained_hilbert_index_cache[key] = index
+    return index
+
+
+# The arrays of all states are only referenced weakly, and are dropped from the
+# cache when nobody is using them anymore.
+_all_states_cache = weakref.WeakValueDictionary()
 
 
 class HomogeneousHilbert(DiscreteHilbert):
@@ -74,13 +156,23 @@ class HomogeneousHilbert(DiscreteHilbert):
             self._local_states = np.asarray(local_states)
             assert self._local_states.ndim == 1
             self._local_size = self._local_states.shape[0]
+            # read-only sorted float64 copy, used to build the index and to convert
+            # states without going through the list of local states every time.
+            self._sorted_local_states = np.sort(self._local_states.astype(np.float64))
+            self._sorted_local_states.flags.writeable = False
             self._local_states = self._local_states.tolist()
-            self._local_states_frozen = frozenset(self._local_states)
+            self._local_states_tuple = tuple(sorted(self._local_states))
         else:
             self._local_states = None
-            self._local_states_frozen = None
+            self._sorted_local_states = None
+            self._local_states_tuple = None
             self._local_size = np.iinfo(np.intp).max
 
+        # dimension of the unconstrained space, known without building the index.
+        self._n_states_unconstrained = (
+            self._local_size**N if self._is_finite else None
+        )
+
         self._constraint_fn = constraint_fn
 
         self.__hilbert_index = None
@@ -114,8 +206,15 @@ class HomogeneousHilbert(DiscreteHilbert):
     def n_states(self) -> int:
         r"""The total dimension of the many-body Hilbert space.
         Throws an exception iff the space is not indexable."""
+        if not self.constrained and self.is_indexable:
+            return self._n_states_unconstrained
         return self._hilbert_index.n_states
 
+    @property
+    def is_indexable(self) -> bool:
+        """Whether the space can be indexed with an integer"""
+        return self._is_finite and self._n_states_unconstrained <= max_states
+
     @property
     def is_finite(self) -> bool:
         r"""Whether the local hilbert space is finite."""
@@ -135,12 +234,28 @@ class HomogeneousHilbert(DiscreteHilbert):
         """
         return self._constraint_fn is not None
 
+    @property
+    def _is_binary(self) -> bool:
+        """
+        Whether the space is unconstrained, indexable and with 2 local states, such
+        that the states can be converted to numbers by packing their bits.
+        """
+        return (
+            self.is_finite
+            and self.local_size == 2
+            and not self.constrained
+            and self.is_indexable
+        )
+
     def _numbers_to_states(self, numbers: np.ndarray, out: np.ndarray) -> np.ndarray:
         # this is guaranteed
         # numbers = concrete_or_error(
         #    np.asarray, numbers, HilbertIndexingDuringTracingError
         # )
 
+        if self._is_binary:
+            return _binary_numbers_to_states(numbers, self._sorted_local_states, out)
+
         return self._hilbert_index.numbers_to_states(numbers, out)
 
     def _states_to_numbers(self, states: np.ndarray, out: np.ndarray):
@@ -149,24 +264,71 @@ class HomogeneousHilbert(DiscreteHilbert):
         #    np.asarray, states, HilbertIndexingDuringTracingError
         # )
 
+        if self._is_binary:
+            return _binary_states_to_numbers(states, self._sorted_local_states, out)
+
         self._hilbert_index.states_to_numbers(states, out)
 
         return out
 
-    def all_states(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+    def all_states(
+        self,
+        out: Optional[np.ndarray] = None,
+        chunk_size: int = 65536,
+        *,
+        dtype: Optional[DType] = None,
+    ) -> np.ndarray:
         r"""Returns all valid states of the Hilbert space.
 
         Throws an exception if the space is not indexable.
 
         Args:
             out: an optional pre-allocated output array
+            chunk_size: The number of states that are converted at once, if the
+                index cannot write all the states directly into `out`.
+            dtype: The dtype of the output array, if it is not pre-allocated
+                (default: float64). A small integer dtype such as `np.int8` reduces
+                the memory required, provided it can represent all local states.
 
         Returns:
             A (n_states x size) batch of states. this corresponds
             to the pre-allocated array if it was passed.
         """
+        if out is None and dtype is None:
+            return self._cached_all_states()
+
+        if out is None:
+            out = self._empty_states(self.n_states, dtype)
+        if out.dtype != np.float64:
+            # The methods of the index only write float64 arrays, but the kernels
+            # of the builtin indices write any dtype directly.
+            index = self._hilbert_index
+            if isinstance(index, UnconstrainedHilbertIndex):
+                return _all_states_kernel(self._sorted_local_states, self.size, out)
+            elif isinstance(index, ConstrainedHilbertIndex):
+                return _numbers_to_states_kernel(
+                    index._bare_numbers, self._sorted_local_states, self.size, out
+                )
+            return super().all_states(out, chunk_size)
         return self._hilbert_index.all_states(out)
 
+    def _cached_all_states(self) -> np.ndarray:
+        """
+        Returns a read-only array with all the states, which is shared among all
+        equal hilbert spaces as long as it is referenced somewhere.
+        """
+        try:
+            states = _all_states_cache.get(self)
+        except TypeError:
+            # the constraint is not hashable
+            return self._hilbert_index.all_states(self._empty_states(self.n_states))
+
+        if states is None:
+            states = self._hilbert_index.all_states(self._empty_states(self.n_states))
+            states.flags.writeable = False
+            _all_states_cache[self] = states
+        return states
+
     @property
     def _hilbert_index(self) -> HilbertIndex:
         """
@@ -178,17 +340,17 @@ class HomogeneousHilbert(DiscreteHilbert):
                 raise RuntimeError("The hilbert space is too large to be indexed.")
 
             else:
-                self.__hilbert_index = (
-                    ConstrainedHilbertIndex(
-                        np.asarray(self.local_states, dtype=np.float64),
-                        self.size,
-                        self._constraint_fn,
+                local_states = self._local_states_tuple
+                constraint_fn = self._constraint_fn if self.constrained else None
+                try:
+                    self.__hilbert_index = _cached_hilbert_index(
+                        local_states, self.size, constraint_fn
                     )
-                    if self.constrained
-                    else UnconstrainedHilbertIndex(
-                        np.asarray(self.local_states, dtype=np.float64), self.size
+                except TypeError:
+                    # the constraint is not hashable
+                    self.__hilbert_index = _build_hilbert_index(
+                        local_states, self.size, constraint_fn
                     )
-                )
         return self.__hilbert_index
 
     def __repr__(self):
@@ -202,7 +364,7 @@ class HomogeneousHilbert(DiscreteHilbert):
         return (
             self.size,
             self.local_size,
-            self._local_states_frozen,
+            self._local_states_tuple,
             self.constrained,
             self._constraint_fn,
         )
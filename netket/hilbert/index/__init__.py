@@ -13,7 +13,7 @@
 # limitations under the License.
 
 """
-This module contains two classes used to index into hilbert spaces
+This module contains the classes used to index into hilbert spaces
 inheriting from `HomogeneousHilbert`.
 
 Those classes provide an informal API that can be used to extend or override
@@ -32,3 +32,4 @@ defined in the file `base.py`.
 from .base import HilbertIndex
 from .unconstrained import UnconstrainedHilbertIndex
 from .constrained import ConstrainedHilbertIndex
+from .combinadic import CombinadicHilbertIndex, SumConstraint
@@ -0,0 +1,198 @@
+# Copyright 2023 The NetKet Authors - All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+from numba.experimental import jitclass
+from numba import int64, float64, jit
+
+
+class SumConstraint:
+    """
+    Constraint selecting the states whose local states sum to `total`.
+
+    Hilbert spaces using this constraint are indexed with a
+    :class:`CombinadicHilbertIndex`, which does not need to enumerate the
+    unconstrained space.
+    """
+
+    def __init__(self, total):
+        self.total = total
+
+    def __call__(self, x):
+        return np.sum(x, axis=1) == self.total
+
+    def __eq__(self, other):
+        return isinstance(other, SumConstraint) and self.total == other.total
+
+    def __hash__(self):
+        return hash((SumConstraint, self.total))
+
+    def __repr__(self):
+        return f"SumConstraint(total={self.total})"
+
+
+@jit(nopython=True, cache=True)
+def _count_table(digits, size, total):
+    """
+    Returns the table such that `counts[k, s]` is the number of ways in which `k`
+    sites can take the values in `digits` summing to `s`.
+    """
+    counts = np.zeros((size + 1, total + 1), dtype=np.int64)
+    counts[0, 0] = 1
+    for k in range(1, size + 1):
+        for s in range(total + 1):
+            for d in digits:
+                if d <= s:
+                    counts[k, s] += counts[k - 1, s - d]
+    return counts
+
+
+@jit(nopython=True, cache=True)
+def _numbers_to_states_kernel(numbers, local_states, digits, counts, total, out):
+    """
+    Enumerative decoding of the numbers into states, in lexicographic order, where
+    the leftmost site is the most significant one.
+    """
+    size = out.shape[1]
+    for i in range(numbers.shape[0]):
+        rank = numbers[i]
+        remainder = total
+        for site in range(size):
+            n_sites_right = size - site - 1
+            for j in range(digits.shape[0]):
+                d = digits[j]
+                if d > remainder:
+                    break
+                n_completions = counts[n_sites_right, remainder - d]
+                if rank < n_completions:
+                    out[i, site] = local_states[j]
+                    remainder -= d
+                    break
+                rank -= n_completions
+    return out
+
+
+@jit(nopython=True, cache=True)
+def _states_to_numbers_kernel(states, local_states, digits, counts, total, out):
+    """
+    Enumerative encoding of the states into numbers. Inverse of
+    `_numbers_to_states_kernel`. States which do not satisfy the constraint, or
+    whose values are not local states, are mapped to `counts[size, total]`, the
+    number of states.
+    """
+    size = states.shape[1]
+    n_states = counts[size, total]
+    for i in range(states.shape[0]):
+        rank = 0
+        remainder = total
+        for site in range(size):
+            n_sites_right = size - site - 1
+            j = np.searchsorted(local_states, states[i, site])
+            if j >= digits.shape[0] or local_states[j] != states[i, site]:
+                remainder = -1
+                break
+            for jj in range(j):
+                d = digits[jj]
+                if d > remainder:
+                    break
+                rank += counts[n_sites_right, remainder - d]
+            remainder -= digits[j]
+            if remainder < 0:
+                break
+        out[i] = rank if remainder == 0 else n_states
+    return out
+
+
+spec = [
+    ("_local_states", float64[::1]),
+    ("_digits", int64[::1]),
+    ("_size", int64),
+    ("_total", int64),
+    ("_counts", int64[:, ::1]),
+]
+
+
+@jitclass(spec)
+class CombinadicHilbertIndex:
+    """
+    Index of an hilbert space with integer local states constrained to a fixed
+    sum.
+
+    The constrained states are numbered in the same order as the
+    `ConstrainedHilbertIndex`, but are encoded and decoded through their
+    combinatorial rank, with a cost proportional to the number of sites and
+    without enumerating the unconstrained space.
+    """
+
+    def __init__(self, local_states, size, total):
+        self._local_states = np.sort(local_states).astype(np.float64)
+        min_state = self._local_states[0]
+        self._digits = (self._local_states - min_state).astype(np.int64)
+        self._size = size
+        self._total = int(round(total - size * min_state))
+        self._counts = _count_table(self._digits, size, self._total)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def n_states(self) -> int:
+        return int(self._counts[self._size, self._total])
+
+    @property
+    def local_states(self):
+        return self._local_states
+
+    @property
+    def local_size(self) -> int:
+        return len(self._local_states)
+
+    def states_to_numbers(self, states, out=None):
+        if states.ndim != 2:
+            raise RuntimeError("Invalid input shape, expecting a 2d array.")
+
+        if out is None:
+            out = np.empty(states.shape[0], np.int64)
+
+        _states_to_numbers_kernel(
+            states, self._local_states, self._digits, self._counts, self._total, out
+        )
+
+        if np.max(out) >= self.n_states:
+            raise RuntimeError(
+                "The required state does not satisfy the given constraints."
+            )
+
+        return out
+
+    def numbers_to_states(self, numbers, out=None):
+        if numbers.ndim != 1:
+            raise RuntimeError("Invalid input shape, expecting a 1d array.")
+
+        if out is None:
+            out = np.empty((numbers.shape[0], self._size))
+
+        return _numbers_to_states_kernel(
+            numbers, self._local_states, self._digits, self._counts, self._total, out
+        )
+
+    def all_states(self, out=None):
+        if out is None:
+            out = np.empty((self.n_states, self._size))
+
+        numbers = np.arange(self.n_states)
+        return _numbers_to_states_kernel(
+            numbers, self._local_states, self._digits, self._counts, self._total, out
+        )
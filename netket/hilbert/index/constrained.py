@@ -36,14 +36,19 @@ def compute_constrained_to_bare_conversion_table(
     and is likely wrong.
     """
 
-    n_chunks = int(np.ceil(hilbert_index.n_states / chunk_size))
+    n_states = hilbert_index.n_states
+    n_chunks = int(np.ceil(n_states / chunk_size))
+    # the states of every chunk are decoded in the same buffer
+    states_buffer = np.empty((min(chunk_size, n_states), hilbert_index.size))
     bare_number_chunks = []
     for i in range(n_chunks):
         id_start = chunk_size * i
-        id_end = np.minimum(chunk_size * (i + 1), hilbert_index.n_states)
+        id_end = min(chunk_size * (i + 1), n_states)
         ids = np.arange(id_start, id_end)
 
-        states = hilbert_index.numbers_to_states(ids)
+        states = hilbert_index.numbers_to_states(
+            ids, states_buffer[: id_end - id_start]
+        )
         is_constrained = constraint_fn(states)
         (chunk_bare_number,) = np.nonzero(is_constrained)
         bare_number_chunks.append(chunk_bare_number + id_start)
@@ -106,13 +111,7 @@ class ConstrainedHilbertIndex:
         # convert to original space
         numbers = self._bare_numbers[numbers]
 
-        if out is None:
-            out = np.empty((numbers.shape[0], self.size))
-
-        for i in range(numbers.shape[0]):
-            out[i] = self._unconstrained_index.number_to_state(numbers[i])
-
-        return out
+        return self._unconstrained_index.numbers_to_states(numbers, out)
 
     def all_states(self, out=None):
-        return self.numbers_to_states(np.arange(self.n_states), out=out)
+        return self._unconstrained_index.numbers_to_states(self._bare_numbers, out)
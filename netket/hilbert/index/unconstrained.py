@@ -14,14 +14,65 @@
 
 import numpy as np
 from numba.experimental import jitclass
-from numba import int64, float64
+from numba import int64, float64, jit
+
+
+@jit(nopython=True, cache=True)
+def _numbers_to_states_kernel(numbers, local_states, size, out):
+    """
+    Mixed-radix decomposition of a batch of numbers into states, where the
+    rightmost site is the least significant digit.
+    """
+    local_size = local_states.shape[0]
+    for i in range(numbers.shape[0]):
+        ip = numbers[i]
+        for k in range(size - 1, -1, -1):
+            out[i, k] = local_states[ip % local_size]
+            ip = ip // local_size
+    return out
+
+
+@jit(nopython=True, cache=True)
+def _states_to_numbers_kernel(states, local_states, size, out):
+    """
+    Horner-form reconstruction of the numbers corresponding to a batch of
+    states. Inverse of `_numbers_to_states_kernel`.
+    """
+    local_size = local_states.shape[0]
+    for i in range(states.shape[0]):
+        number = 0
+        for j in range(size):
+            number = number * local_size + np.searchsorted(local_states, states[i, j])
+        out[i] = number
+    return out
+
+
+@jit(nopython=True, cache=True)
+def _all_states_kernel(local_states, size, out):
+    """
+    Enumerates all states in the order of increasing number, by incrementing the
+    previous state as an odometer instead of decomposing every number.
+    """
+    local_size = local_states.shape[0]
+    digits = np.zeros(size, dtype=np.int64)
+    for i in range(out.shape[0]):
+        for k in range(size):
+            out[i, k] = local_states[digits[k]]
+        k = size - 1
+        while k >= 0:
+            digits[k] += 1
+            if digits[k] < local_size:
+                break
+            digits[k] = 0
+            k -= 1
+    return out
 
 
 spec = [
-    ("_local_states", float64[:]),
+    ("_local_states", float64[::1]),
     ("_local_size", int64),
     ("_size", int64),
-    ("_basis", int64[:]),
+    ("_basis", int64[::1]),
 ]
 
 
@@ -83,14 +134,7 @@ class UnconstrainedHilbertIndex:
         # else:
         #     assert out.size == states.shape[0]
 
-        for i in range(states.shape[0]):
-            out[i] = 0
-            for j in range(self._size):
-                out[i] += (
-                    self._local_state_number(states[i, self._size - j - 1])
-                    * self._basis[j]
-                )
-        return out
+        return _states_to_numbers_kernel(states, self._local_states, self._size, out)
 
     def numbers_to_states(self, numbers, out=None):
         if numbers.ndim != 1:
@@ -101,15 +145,10 @@ class UnconstrainedHilbertIndex:
         # else:
         #     assert out.shape == (numbers.shape[0], self._size)
 
-        for i, n in enumerate(numbers):
-            out[i] = self.number_to_state(n)
-
-        return out
+        return _numbers_to_states_kernel(numbers, self._local_states, self._size, out)
 
     def all_states(self, out=None):
         if out is None:
             out = np.empty((self.n_states, self._size))
 
-        for i in range(self.n_states):
-            self.number_to_state(i, out[i])
-        return out
+        return _all_states_kernel(self._local_states, self._size, out)
@@ -60,7 +60,7 @@ class TensorDiscreteHilbert(TensorHilbert, DiscreteHilbert):
         super().__init__(hilb_spaces, shape=shape)
 
         # pre-compute indexing data iff the tensor space is still indexable
-        if all(hi.is_indexable for hi in hilb_spaces) and _is_indexable(shape):
+        if all(hi.is_indexable for hi in hilb_spaces) and _is_indexable(self.shape):
             self._ns_states = [hi.n_states for hi in self._hilbert_spaces]
             self._ns_states_r = np.flip(self._ns_states)
             self._cum_ns_states = np.concatenate([[0], np.cumprod(self._ns_states)])
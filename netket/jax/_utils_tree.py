@@ -14,16 +14,16 @@
 
 from functools import reduce
 from typing import Callable
+import math
 
+import numpy as np
 
 import jax
-import netket.jax as nkjax
 from jax import numpy as jnp
 from jax.tree_util import (
     register_pytree_node,
     tree_flatten,
     tree_unflatten,
-    tree_map,
     tree_leaves,
 )
 
@@ -44,11 +44,40 @@ def tree_ravel(pytree: PyTree) -> tuple[jnp.ndarray, Callable]:
       structure as the input ``pytree``.
     """
     leaves, treedef = tree_flatten(pytree)
-    flat, unravel_list = nkjax.vjp(_ravel_list, *leaves)
-    unravel_pytree = lambda flat: tree_unflatten(treedef, unravel_list(flat))
+    flat = _ravel_list(*leaves)
+
+    # Unraveling only needs to slice the vector and reshape the slices, so it is
+    # built from the shapes and dtypes of the leaves instead of tracing a vjp.
+    shapes = [jnp.shape(leaf) for leaf in leaves]
+    dtypes = [jnp.result_type(leaf) for leaf in leaves]
+    offsets = np.cumsum([math.prod(shape) for shape in shapes])[:-1]
+    is_complex = jnp.iscomplexobj(flat)
+
+    def unravel_pytree(flat):
+        chunks = jnp.split(flat, offsets) if leaves else []
+        return tree_unflatten(
+            treedef,
+            [
+                _unravel_leaf(chunk, shape, dtype, is_complex)
+                for chunk, shape, dtype in zip(chunks, shapes, dtypes)
+            ],
+        )
+
     return flat, unravel_pytree
 
 
+def _unravel_leaf(chunk, shape, dtype, is_complex):
+    # Matches the vjp of _ravel_list: the real leaves of a complex vector are
+    # projected to their real part, while a complex vector unraveled into a
+    # real pytree keeps its imaginary part.
+    if jnp.iscomplexobj(chunk) and not jnp.issubdtype(dtype, jnp.complexfloating):
+        if is_complex:
+            chunk = chunk.real
+        else:
+            dtype = jnp.promote_types(dtype, jnp.complex64)
+    return chunk.reshape(shape).astype(dtype)
+
+
 def _ravel_list(*lst):
     return jnp.concatenate([jnp.ravel(elt) for elt in lst]) if lst else jnp.array([])
 
@@ -69,37 +98,72 @@ def tree_size(tree: PyTree) -> int:
     Returns the sum of the size of all leaves in the tree.
     It's equivalent to the number of scalars in the pytree.
     """
-    return sum(tree_leaves(tree_map(lambda x: x.size, tree)))
+    return sum(leaf.size for leaf in tree_leaves(tree))
+
+
+def _tree_real_complex_flags(pars: PyTree) -> tuple[bool, bool]:
+    """
+    Returns whether the tree has at least one real and one complex leaf, stopping
+    as soon as both are found.
+    """
+    has_real = has_complex = False
+    for leaf in tree_leaves(pars):
+        if jnp.iscomplexobj(leaf):
+            has_complex = True
+        else:
+            has_real = True
+        if has_real and has_complex:
+            break
+    return has_real, has_complex
 
 
 def tree_leaf_iscomplex(pars: PyTree) -> bool:
     """
     Returns true if at least one leaf in the tree has complex dtype.
     """
-    return any(jax.tree_util.tree_leaves(jax.tree_map(jnp.iscomplexobj, pars)))
+    return any(jnp.iscomplexobj(leaf) for leaf in tree_leaves(pars))
 
 
 def tree_leaf_isreal(pars: PyTree) -> bool:
     """
     Returns true if at least one leaf in the tree has real dtype.
     """
-    return any(jax.tree_util.tree_leaves(jax.tree_map(jnp.isrealobj, pars)))
+    return any(jnp.isrealobj(leaf) for leaf in tree_leaves(pars))
 
 
 def tree_ishomogeneous(pars: PyTree) -> bool:
     """
     Returns true if all leaves have real dtype or all leaves have complex dtype.
     """
-    return not (tree_leaf_isreal(pars) and tree_leaf_iscomplex(pars))
+    has_real, has_complex = _tree_real_complex_flags(pars)
+    return not (has_real and has_complex)
 
 
-@jax.jit
 def tree_conj(t: PyTree) -> PyTree:
     r"""
     Conjugate all complex leaves. The real leaves are left untouched.
     Args:
         t: pytree
     """
+    # the dtypes are known before tracing, so trees without complex leaves are
+    # returned without dispatching a jitted identity.
+    if not tree_leaf_iscomplex(t):
+        return _tree_asarray(t)
+    return _tree_conj(t)
+
+
+def _tree_asarray(t: PyTree) -> PyTree:
+    """
+    Converts the leaves of t to jax arrays, returning t itself if they all are
+    already jax arrays.
+    """
+    if all(isinstance(x, jax.Array) for x in tree_leaves(t)):
+        return t
+    return jax.tree_map(jnp.asarray, t)
+
+
+@jax.jit
+def _tree_conj(t: PyTree) -> PyTree:
     return jax.tree_map(lambda x: jax.lax.conj(x) if jnp.iscomplexobj(x) else x, t)
 
 
@@ -114,13 +178,20 @@ def tree_dot(a: PyTree, b: PyTree) -> Scalar:
     Returns:
         A scalar equal the dot product of of the flattened arrays of a and b.
     """
-    return jax.tree_util.tree_reduce(
-        jax.numpy.add,
-        jax.tree_map(jax.numpy.sum, jax.tree_map(jax.numpy.multiply, a, b)),
+    # a single dot per leaf, without materializing the element-wise products.
+    # Contrary to vdot, dot does not conjugate its first argument. The highest
+    # precision avoids the reduced-precision matmul passes of TPUs and GPUs.
+    leaves_a, treedef = tree_flatten(a)
+    leaves_b = treedef.flatten_up_to(b)
+    return reduce(
+        jnp.add,
+        (
+            jnp.dot(jnp.ravel(x), jnp.ravel(y), precision=jax.lax.Precision.HIGHEST)
+            for x, y in zip(leaves_a, leaves_b)
+        ),
     )
 
 
-@jax.jit
 def tree_cast(x: PyTree, target: PyTree) -> PyTree:
     r"""
     cast x the types of target
@@ -133,6 +204,19 @@ def tree_cast(x: PyTree, target: PyTree) -> PyTree:
         A pytree where each leaf of x is cast to the dtype of the corresponding leaf in target.
         The imaginary part of complex leaves which are cast to real is discarded.
     """
+    # trees which already have the target dtypes are only converted to jax arrays.
+    leaves_x, treedef = tree_flatten(x)
+    leaves_target = treedef.flatten_up_to(target)
+    if all(
+        hasattr(leaf, "dtype") and leaf.dtype == getattr(leaf_target, "dtype", None)
+        for leaf, leaf_target in zip(leaves_x, leaves_target)
+    ):
+        return _tree_asarray(x)
+    return _tree_cast(x, target)
+
+
+@jax.jit
+def _tree_cast(x: PyTree, target: PyTree) -> PyTree:
     # astype alone would also work, however that raises ComplexWarning when casting complex to real
     # therefore the real is taken first where needed
     return jax.tree_map(
@@ -185,13 +269,15 @@ register_pytree_node(
 
 
 def _tree_to_real(x):
-    if not tree_leaf_iscomplex(x):
+    leaves, treedef = tree_flatten(x)
+    is_complex = [jnp.iscomplexobj(leaf) for leaf in leaves]
+    if not any(is_complex):
         return x
     # TODO find a way to make it a nop?
     # return jax.vmap(lambda y: jnp.array((y.real, y.imag)))(x)
-    r = jax.tree_map(lambda x: x.real if jnp.iscomplexobj(x) else x, x)
-    i = jax.tree_map(lambda x: x.imag if jnp.iscomplexobj(x) else None, x)
-    return RealImagTuple((r, i))
+    r = [leaf.real if c else leaf for leaf, c in zip(leaves, is_complex)]
+    i = [leaf.imag if c else None for leaf, c in zip(leaves, is_complex)]
+    return RealImagTuple((tree_unflatten(treedef, r), tree_unflatten(treedef, i)))
 
 
 def _tree_to_real_inverse(x):
@@ -223,7 +309,15 @@ def compose(*funcs):
     compose(f,g,h)(x) is equivalent to f(g(h(x)))
     """
 
-    def _compose(f, g):
-        return lambda *args, **kwargs: f(g(*args, **kwargs))
+    *outer, inner = funcs
+    outer = tuple(reversed(outer))
+
+    # a single frame applying the functions in sequence, instead of one nested
+    # lambda for every function
+    def _composed(*args, **kwargs):
+        res = inner(*args, **kwargs)
+        for f in outer:
+            res = f(res)
+        return res
 
-    return reduce(_compose, funcs)
+    return _composed
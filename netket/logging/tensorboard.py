@@ -50,6 +50,10 @@ def tree_log(tree, root, data):
     elif hasattr(tree, "to_dict"):
         tree_log(tree.to_dict(), root, data)  # noqa: F722
 
+    elif hasattr(tree, "ndim") and tree.ndim == 0:
+        # 0-d arrays, such as jax scalars, are not instances of numbers.Number
+        tree_log(tree.item(), root, data)
+
     elif isinstance(tree, complex):
         tree_log(tree.real, f"{root}/re", data)
         tree_log(tree.imag, f"{root}/im", data)
@@ -135,6 +139,44 @@ class TensorBoardLog(AbstractLog):
         if self._writer is None:
             self._init_tensorboard()
 
+        self._add_scalars(step, item)
+
+        self._writer.flush()
+        self._old_step = step
+
+    def log_batch(self, steps, items, machine=None):
+        """
+        Logs several steps at once, writing them to disk only once at the end.
+
+        This is equivalent to calling the logger on every step and item, but
+        is faster when many entries are logged together.
+
+        Args:
+            steps: a sequence of monotonically increasing integer steps.
+            items: a sequence of dictionaries of data, one for every step.
+            machine: optional variational state, unused by this logger.
+
+        Raises:
+            ValueError: if `steps` and `items` have different lengths.
+        """
+        steps = list(steps)
+        items = list(items)
+        if len(steps) != len(items):
+            raise ValueError(
+                f"Got {len(steps)} steps but {len(items)} items: there must be "
+                "exactly one item for every step."
+            )
+
+        if self._writer is None:
+            self._init_tensorboard()
+
+        for step, item in zip(steps, items):
+            self._add_scalars(step, item)
+            self._old_step = step
+
+        self._writer.flush()
+
+    def _add_scalars(self, step, item):
         data = []
         tree_log(item, "", data)
 
@@ -142,9 +184,6 @@ class TensorBoardLog(AbstractLog):
             if isinstance(val, Number):
                 self._writer.add_scalar(key[1:], val, step)
 
-        self._writer.flush()
-        self._old_step = step
-
     def __del__(self):
         self.flush()
 
@@ -18,6 +18,7 @@ from collections.abc import Iterator
 import warnings
 
 import numpy as np
+import jax
 from flax import linen as nn
 from jax import numpy as jnp
 
@@ -65,6 +66,10 @@ def compute_n_chains(
     return n_chains_per_rank * mpi.n_nodes
 
 
+def _log_pdf(apply_fun, machine_pow, pars, σ):
+    return machine_pow * apply_fun(pars, σ).real
+
+
 class SamplerState(struct.Pytree):
     """
     Base class holding the state of a sampler.
@@ -78,7 +83,8 @@ class Sampler(struct.Pytree):
     It contains the fields that all of them should possess, defining the common
     API.
     Note that fields marked with `pytree_node=False` are treated as static arguments
-    when jitting.
+    when jitting. All fields of the base class are static, so that only the arrays
+    held by a subclass (for example by its transition rule) are traced.
 
     Subclasses should be NetKet dataclasses and they should define the `_init_state`,
     `_reset` and `_sample_chain` methods which only accept positional arguments.
@@ -92,7 +98,7 @@ class Sampler(struct.Pytree):
     hilbert: AbstractHilbert = struct.field(pytree_node=False)
     """The Hilbert space to sample."""
 
-    machine_pow: int = struct.field(default=2)
+    machine_pow: int = struct.field(pytree_node=False, default=2)
     """The power to which the machine should be exponentiated to generate the pdf."""
 
     dtype: DType = struct.field(pytree_node=False, default=float)
@@ -178,6 +184,24 @@ class Sampler(struct.Pytree):
         """
         return False
 
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        leaves, treedef = jax.tree_util.tree_flatten(self)
+        other_leaves, other_treedef = jax.tree_util.tree_flatten(other)
+        return treedef == other_treedef and all(
+            np.array_equal(x, y) for x, y in zip(leaves, other_leaves)
+        )
+
+    def __hash__(self):
+        # Only static fields are hashed, as array leaves are not hashable.
+        static_fields = tuple(
+            getattr(self, k)
+            for k in self._pytree__static_fields
+            if k != "_pytree__node_fields"
+        )
+        return hash((type(self), static_fields))
+
     def log_pdf(self, model: Union[Callable, nn.Module]) -> Callable:
         """
         Returns a closure with the log-pdf function encoded by this sampler.
@@ -194,10 +218,7 @@ class Sampler(struct.Pytree):
             does not trigger recompilation.
         """
         apply_fun = get_afun_if_module(model)
-        return HashablePartial(
-            lambda apply_fun, pars, σ: self.machine_pow * apply_fun(pars, σ).real,
-            apply_fun,
-        )
+        return HashablePartial(_log_pdf, apply_fun, self.machine_pow)
 
     def init_state(self, machine: Union[Callable, nn.Module], parameters: PyTree, seed: Optional[SeedT] = None) -> SamplerState:
         """
@@ -269,7 +290,7 @@ class Sampler(struct.Pytree):
 
         return self._sample_chain(wrap_afun(machine), parameters, state, chain_length)
 
-    def samples(self, machine: Union[Callable, nn.Module], parameters: PyTree, *, state: Optional[SamplerState] = None, chain_length: int = 1) -> Iterator[jnp.ndarray]:
+    def samples(self, machine: Union[Callable, nn.Module], parameters: PyTree, *, state: Optional[SamplerState] = None, chain_length: int = 1, block_size: int = 64) -> Iterator[jnp.ndarray]:
         """
         Returns a generator sampling `chain_length` batches of samples along the chains.
 
@@ -279,15 +300,27 @@ class Sampler(struct.Pytree):
             parameters: The PyTree of parameters of the model.
             state: The current state of the sampler. If not specified, then initialize and reset it.
             chain_length: The length of the chains (default = 1).
+            block_size: The number of batches generated by every call to the sampler,
+                which are then yielded one at a time (default = 64). Up to `block_size`
+                batches are therefore sampled before they are requested.
         """
+        if block_size < 1:
+            raise ValueError(
+                f"block_size must be a positive integer, but you specified {block_size}"
+            )
+
         if state is None:
             state = self.reset(machine, parameters)
 
         machine = wrap_afun(machine)
 
-        for _i in range(chain_length):
-            samples, state = self._sample_chain(machine, parameters, state, 1)
-            yield samples[:, 0, :]
+        # The last block is shorter when block_size does not divide chain_length,
+        # at the cost of compiling the sampler a second time for its length.
+        for start in range(0, chain_length, block_size):
+            length = min(block_size, chain_length - start)
+            samples, state = self._sample_chain(machine, parameters, state, length)
+            for i in range(length):
+                yield samples[:, i, :]
 
     @abc.abstractmethod
     def _sample_chain(
@@ -1,21 +1,26 @@
 import importlib
 import sys
-from subprocess import CalledProcessError, PIPE, check_output
+from functools import cache
+from subprocess import CalledProcessError, TimeoutExpired, run
 
 
-def exec_in_terminal(command):
+def exec_in_terminal(command, timeout: float = 10):
     """Run a command in the terminal and get the
     output stripping the last newline.
 
     Args:
         command: a string or list of strings
+        timeout: the number of seconds after which the command is killed and
+            `subprocess.TimeoutExpired` is raised.
     """
     # On Windows, when using `where` to find a command, it will output some
     # message to stderr if the command is not found.
-    # We redirect stderr to PIPE to prevent that message from showing on the screen.
-    return check_output(command, stderr=PIPE).strip().decode("utf8")
+    # We capture stderr to prevent that message from showing on the screen.
+    result = run(command, capture_output=True, text=True, timeout=timeout, check=True)
+    return result.stdout.strip()
 
 
+@cache
 def is_available(lib_name: str) -> bool:
     """
     Checks if a library can be imported
@@ -29,6 +34,7 @@ def is_available(lib_name: str) -> bool:
     return available
 
 
+@cache
 def version(lib_name) -> str:
     """
     Returns the version of a library as a string or
@@ -46,6 +52,7 @@ def _version(lib_name):
     return lib.__version__ if hasattr(lib, "__version__") else "available"
 
 
+@cache
 def get_executable_path(name):
     """
     Get the path of an executable.
@@ -54,6 +61,6 @@ def get_executable_path(name):
     os_which = "where" if sys.platform.startswith("win32") else "which"
     try:
         path = exec_in_terminal([os_which, name])
-    except (CalledProcessError, FileNotFoundError):
+    except (CalledProcessError, FileNotFoundError, TimeoutExpired):
         path = ""
     return path
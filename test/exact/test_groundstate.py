@@ -2,6 +2,8 @@ import pytest
 from pytest import approx
 import netket as nk
 import numpy as np
+import scipy.sparse
+from scipy.sparse.linalg import ArpackNoConvergence
 
 from .. import common
 
@@ -71,6 +73,116 @@ def test_ed(ha, matrix_free):
     assert w == approx(w_full[:3], rel=1e-14, abs=1e-14)
 
 
+@pytest.mark.parametrize(
+    "matrix_free", [pytest.param(x, id=f"matrix_free={x}") for x in [False, True]]
+)
+@pytest.mark.parametrize(
+    "ha", [pytest.param(op, id=name) for name, op in operators.items()]
+)
+def test_ed_lobpcg(ha, matrix_free):
+    first_n = 2
+
+    w_arpack = nk.exact.lanczos_ed(ha, k=first_n)
+
+    w, v = nk.exact.lanczos_ed(
+        ha,
+        k=first_n,
+        compute_eigenvectors=True,
+        matrix_free=matrix_free,
+        method="lobpcg",
+        scipy_args={"seed": 1234},
+    )
+    assert w.shape == (first_n,)
+    assert v.shape == (hi.n_states, first_n)
+    assert w == approx(w_arpack, rel=1e-8)
+    assert np.vdot(v[:, 0], ha(v[:, 0])) == approx(w[0], rel=1e-8)
+
+    w = nk.exact.lanczos_ed(ha, k=first_n, matrix_free=matrix_free, method="lobpcg")
+    assert w == approx(w_arpack, rel=1e-8)
+
+    # a diagonal preconditioner approximating the inverse of the shifted operator
+    diag = np.real(np.diag(np.asarray(ha.to_dense())))
+    M = scipy.sparse.diags(1 / (diag - diag.min() + 1.0))
+    w = nk.exact.lanczos_ed(
+        ha, k=first_n, matrix_free=matrix_free, method="lobpcg", preconditioner=M
+    )
+    assert w == approx(w_arpack, rel=1e-8)
+
+    with pytest.raises(ValueError, match="method must be"):
+        nk.exact.lanczos_ed(ha, method="unknown")
+
+    with pytest.raises(ArpackNoConvergence):
+        nk.exact.lanczos_ed(
+            ha,
+            k=first_n,
+            matrix_free=matrix_free,
+            method="lobpcg",
+            scipy_args={"maxiter": 2, "seed": 1234},
+        )
+
+
+@pytest.mark.parametrize(
+    "matrix_free", [pytest.param(x, id=f"matrix_free={x}") for x in [False, True]]
+)
+@pytest.mark.parametrize(
+    "ha", [pytest.param(op, id=name) for name, op in operators.items()]
+)
+def test_ed_shift_invert(ha, matrix_free):
+    first_n = 3
+
+    w_arpack = nk.exact.lanczos_ed(ha, k=first_n)
+
+    w, v = nk.exact.lanczos_ed(
+        ha,
+        k=first_n,
+        compute_eigenvectors=True,
+        matrix_free=matrix_free,
+        sigma=w_arpack[0] - 0.1,
+    )
+    assert w == approx(w_arpack, rel=1e-10)
+    assert np.vdot(v[:, 0], ha(v[:, 0])) == approx(w[0], rel=1e-10)
+
+    w = nk.exact.lanczos_ed(
+        ha, k=first_n, matrix_free=matrix_free, sigma=w_arpack[0] - 0.1
+    )
+    assert w == approx(w_arpack, rel=1e-10)
+
+    with pytest.raises(ValueError, match="sigma"):
+        nk.exact.lanczos_ed(ha, method="lobpcg", sigma=0.0)
+
+
+def test_sparse_rows():
+    from netket.exact import _sparse_rows
+
+    # the padding of get_conn_padded does not satisfy the particle constraint
+    hi_bosons = nk.hilbert.Fock(n_max=3, N=4, n_particles=3)
+    bose_hubbard = nk.operator.BoseHubbard(
+        hi_bosons, graph=nk.graph.Chain(4), U=1.0, V=0.5, mu=0.3
+    )
+
+    for ha in [*operators.values(), bose_hubbard]:
+        A = np.asarray(ha.to_dense())
+
+        n = ha.hilbert.n_states
+        for start, stop in [(0, n), (3, n - 5), (7, 7)]:
+            rows = _sparse_rows(ha, start, stop, chunk_size=7)
+            assert rows.shape == (stop - start, n)
+            np.testing.assert_allclose(rows.toarray(), A[start:stop])
+
+
+def test_ed_distributed_single_rank():
+    ha = operators["Ising 1D"]
+
+    # with a single rank the matrix is not distributed
+    w = nk.exact.lanczos_ed(ha, k=3, distributed=True)
+    assert w == approx(nk.exact.lanczos_ed(ha, k=3))
+
+    with pytest.raises(ValueError, match="distributed=True"):
+        nk.exact.lanczos_ed(ha, matrix_free=True, distributed=True)
+    with pytest.raises(ValueError, match="distributed=True"):
+        nk.exact.lanczos_ed(ha, sigma=-10.0, distributed=True)
+
+
 def test_ed_restricted():
     g = nk.graph.Hypercube(length=8, n_dim=1, pbc=True)
     hi1 = nk.hilbert.Spin(s=0.5, N=g.n_nodes, total_sz=0)
@@ -51,25 +51,18 @@ def liouvillian():
 def test_exact_ss_ed(liouvillian, sparse):
     lind = liouvillian
 
-    dm_ss = nk.exact.steady_state(lind, method="ed", sparse=sparse)
     Lop = lind.to_sparse()
 
-    mat = np.abs(Lop @ dm_ss.reshape(-1))
-    np.testing.assert_allclose(dm_ss.trace() - 1, 0.0, rtol=1e-5, atol=1e-8)
+    # the sparse eigensolver starts from a different random vector at every call
+    for _ in range(10 if sparse else 1):
+        dm_ss = nk.exact.steady_state(lind, method="ed", sparse=sparse)
 
-    # it does not work for sparse
-    if not sparse:
-        with pytest.warns(UserWarning):
-            nk.exact.steady_state(lind, method="ed", sparse=sparse)
-    else:
-        np.testing.assert_allclose(mat, 0.0, rtol=1e-4, atol=1e-4)
+        mat = np.abs(Lop @ dm_ss.reshape(-1))
+        np.testing.assert_allclose(dm_ss.trace() - 1, 0.0, rtol=1e-5, atol=1e-8)
 
-    # dm_ss_d = nk.exact.steady_state(lind, method="ed", sparse=False)
-    # Lop = lind.to_sparse()
-
-    # mat = np.abs(dm_ss - dm_ss_d)
-    # print(mat)
-    # np.testing.assert_allclose(mat, 0.0, rtol=1e-4, atol=1e-4)
+        np.testing.assert_allclose(mat, 0.0, rtol=1e-4, atol=1e-4)
+        if sparse:
+            assert mat.max() < 1e-8
 
 
 @pytest.mark.parametrize("sparse", [True, False])
@@ -92,3 +85,38 @@ def test_exact_ss_iterative(liouvillian, sparse, rho0):
     mat = np.abs(Lop @ dm_ss.reshape(-1))
     np.testing.assert_allclose(mat, 0.0, rtol=1e-5, atol=1e-5)
     np.testing.assert_allclose(dm_ss.trace() - 1, 0.0, rtol=1e-5, atol=1e-5)
+
+
+def test_exact_ss_iterative_preconditioner_cache(liouvillian):
+    from netket.exact import _lindblad_ilu_preconditioner
+
+    def precond(lind):
+        return _lindblad_ilu_preconditioner(
+            lind.to_sparse(), lind.hilbert.physical.n_states
+        )
+
+    M1 = precond(liouvillian)
+    M2 = precond(liouvillian)
+    assert M1 is M2
+
+    # the factorization is reused by close lindbladians with the same sparsity pattern
+    lind2 = nk.operator.LocalLiouvillian(
+        (1.0 + 1e-4) * liouvillian.hamiltonian, liouvillian.jump_operators
+    )
+    assert precond(lind2) is M1
+
+    # but not by distant ones
+    lind3 = nk.operator.LocalLiouvillian(
+        2.0 * liouvillian.hamiltonian, liouvillian.jump_operators
+    )
+    M3 = precond(lind3)
+    assert M3 is not M1
+    assert precond(lind3) is M3
+
+    lind4 = nk.operator.LocalLiouvillian(
+        liouvillian.hamiltonian, liouvillian.jump_operators[:1]
+    )
+    assert precond(lind4) is not M3
+
+    nk.exact.clear_steady_state_cache()
+    assert precond(liouvillian) is not M1
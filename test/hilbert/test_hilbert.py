@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import gc
 import itertools
+import weakref
 from math import prod
 from functools import partial
 import netket as nk
@@ -399,6 +401,143 @@ def test_state_iteration():
     for state, ref in zip(hilbert.states(), reference):
         np.testing.assert_allclose(state, ref)
 
+    states = list(hilbert.states(chunk_size=100))
+    assert len(states) == hilbert.n_states
+    np.testing.assert_allclose(np.stack(states), hilbert.all_states())
+
+
+def test_all_states_chunked():
+    hi = Spin(s=0.5, N=3) * Fock(n_max=2, N=2)
+
+    numbers = np.arange(hi.n_states)
+    np.testing.assert_allclose(
+        hi.all_states(chunk_size=7), hi.numbers_to_states(numbers)
+    )
+
+    # subclasses may return a new array instead of filling `out` in place
+    class ReturningHilbert(type(hi)):
+        def _numbers_to_states(self, numbers, out):
+            return super()._numbers_to_states(numbers, np.empty_like(out))
+
+    np.testing.assert_allclose(
+        ReturningHilbert(*hi.subspaces).all_states(chunk_size=7),
+        hi.numbers_to_states(numbers),
+    )
+
+    # the homogeneous spaces accept the same positional arguments
+    hi = Fock(n_max=3, N=3)
+    np.testing.assert_allclose(hi.all_states(None, 7), hi.all_states())
+
+
+@pytest.mark.parametrize(
+    "hi",
+    [
+        pytest.param(Spin(s=1, N=4), id="Spin"),
+        pytest.param(Spin(s=0.5, N=6, total_sz=0), id="Spin-constrained"),
+        pytest.param(Spin(s=0.5, N=3) * Fock(n_max=2, N=2), id="Tensor"),
+    ],
+)
+def test_all_states_dtype(hi):
+    states = hi.all_states(dtype=np.int8)
+    assert states.dtype == np.int8
+    np.testing.assert_equal(states, hi.all_states())
+
+
+def test_hilbert_index_is_shared():
+    assert Spin(s=0.5, N=6)._hilbert_index is Spin(s=0.5, N=6)._hilbert_index
+    assert Spin(s=0.5, N=6)._hilbert_index is not Spin(s=0.5, N=5)._hilbert_index
+    assert (
+        Spin(s=0.5, N=6, total_sz=0)._hilbert_index
+        is not Spin(s=0.5, N=6)._hilbert_index
+    )
+
+
+def test_n_states_unconstrained():
+    hi = Spin(s=0.5, N=30)
+    assert hi.n_states == 2**30
+    assert hi._HomogeneousHilbert__hilbert_index is None
+
+    assert Fock(n_max=3, N=15).is_indexable
+    assert not Fock(n_max=3, N=16).is_indexable
+    assert not Fock(N=2).is_indexable
+
+
+def test_all_states_cached():
+    states = Spin(s=0.5, N=6).all_states()
+    assert not states.flags.writeable
+    assert Spin(s=0.5, N=6).all_states() is states
+
+    # states are not cached when the output or the dtype are specified
+    out = np.empty_like(states)
+    assert Spin(s=0.5, N=6).all_states(out) is out
+    assert Spin(s=0.5, N=6).all_states(dtype=np.int8).flags.writeable
+
+
+def test_all_states_dtype_error():
+    with pytest.raises(ValueError, match="cannot be represented"):
+        Fock(n_max=200, N=2).all_states(dtype=np.int8)
+
+    with pytest.raises(ValueError, match="cannot be represented"):
+        CustomHilbert(local_states=[0.5, 1.5], N=2).all_states(dtype=np.int8)
+
+
+@pytest.mark.parametrize(
+    "hi",
+    [
+        pytest.param(Spin(s=0.5, N=10), id="Spin"),
+        pytest.param(Qubit(N=3), id="Qubit"),
+        pytest.param(CustomHilbert(local_states=[3, -2], N=7), id="CustomHilbert"),
+    ],
+)
+def test_binary_indexing(hi):
+    # the bit-packing conversion must agree with the generic HilbertIndex
+    assert hi._is_binary
+
+    numbers = np.arange(hi.n_states)
+    states = hi.numbers_to_states(numbers)
+    np.testing.assert_allclose(states, hi._hilbert_index.all_states())
+    np.testing.assert_allclose(
+        hi.states_to_numbers(states), hi._hilbert_index.states_to_numbers(states)
+    )
+    np.testing.assert_allclose(hi.states_to_numbers(states), numbers)
+
+
+@pytest.mark.parametrize(
+    "hi",
+    [
+        pytest.param(Spin(s=0.5, N=7, total_sz=0.5), id="Spin-1/2"),
+        pytest.param(Spin(s=1, N=5, total_sz=-1), id="Spin-1"),
+        pytest.param(Fock(n_max=3, N=5, n_particles=4), id="Fock"),
+        pytest.param(Fock(N=4, n_particles=3), id="Fock-nmax"),
+    ],
+)
+def test_combinadic_indexing(hi):
+    # the combinatorial ranking must agree with enumerating the constrained states
+    index = hi._hilbert_index
+    assert isinstance(index, nk.hilbert.index.CombinadicHilbertIndex)
+
+    reference = nk.hilbert.index.ConstrainedHilbertIndex(
+        np.asarray(hi.local_states, dtype=np.float64), hi.size, hi._constraint_fn
+    )
+    states = reference.all_states()
+    numbers = np.arange(reference.n_states)
+
+    assert index.n_states == reference.n_states
+    np.testing.assert_equal(index.all_states(), states)
+    np.testing.assert_equal(hi.numbers_to_states(numbers), states)
+    np.testing.assert_equal(hi.states_to_numbers(states), numbers)
+
+    with pytest.raises(RuntimeError, match="does not satisfy the given constraints"):
+        hi.states_to_numbers(np.full(hi.size, hi.local_states[-1]))
+
+    # values which are not local states, even if they satisfy the constraint
+    for value in [hi.local_states[-1] + 2, hi.local_states[0] + 0.5]:
+        state = np.asarray(states[0], dtype=np.float64).copy()
+        state[0] = value
+        state[1] -= value - states[0][0]
+        with pytest.raises(RuntimeError, match="does not satisfy the given"):
+            hi.states_to_numbers(state)
+
 
 def test_composite_hilbert_spin():
     hi1 = Spin(s=1 / 2, N=8)
@@ -663,6 +802,15 @@ def test_pow():
     hi = Spin(s=1 / 2, N=2)
     assert hi**5 == Spin(1 / 2, N=10)
 
+    hi = Fock(n_max=2, N=1) * Spin(s=1 / 2, N=1)
+    hi_prod = hi
+    for n in range(2, 8):
+        hi_prod = hi_prod * hi
+        assert hi**n == hi_prod
+
+    with pytest.raises(ValueError):
+        hi**0
+
 
 def test_constrained_eq_hash():
     hi1 = nk.hilbert.Spin(0.5, 4, total_sz=0)
@@ -719,3 +867,22 @@ def test_particle_alternative_constructors():
 
     with pytest.raises(ValueError, match=r".*must be specified.*"):
         nk.hilbert.Particle(N=5, L=3)
+
+
+def test_hilbert_index_custom_constraint_not_pinned():
+    def constraint(x):
+        return np.sum(x, axis=-1) == 1
+
+    hi = nk.hilbert.CustomHilbert([0, 1], N=4, constraint_fn=constraint)
+    index = hi._hilbert_index
+    assert hi.n_states == 4
+    assert (
+        nk.hilbert.CustomHilbert([0, 1], N=4, constraint_fn=constraint)._hilbert_index
+        is index
+    )
+
+    # the index is dropped from the cache when no hilbert space uses it anymore
+    index_ref = weakref.ref(index)
+    del hi, index
+    gc.collect()
+    assert index_ref() is None
@@ -33,3 +33,110 @@ def test_tree_to_real(tree):
         tree_restored
     )
     jax.tree_map(np.testing.assert_allclose, tree_restored, tree)
+
+
+@pytest.mark.parametrize(
+    "tree",
+    [
+        {"a": 1.0, "b": (1.0, 1 + 2.0j, 3.0j)},
+        {
+            "a": jnp.ones(100),
+            "b": (jnp.ones((1, 2)) + 3.0j, jnp.ones(3, dtype=jnp.float32)),
+            "c": jnp.array(2.0),
+        },
+        {},
+    ],
+)
+def test_tree_ravel(tree):
+    leaves = jax.tree_util.tree_leaves(tree)
+    flat, unravel = nk.jax.tree_ravel(tree)
+
+    assert flat.ndim == 1
+    if leaves:
+        np.testing.assert_allclose(
+            flat, jnp.concatenate([jnp.ravel(jnp.asarray(x)) for x in leaves])
+        )
+    assert jax.tree_util.tree_structure(unravel(flat)) == jax.tree_util.tree_structure(
+        tree
+    )
+    jax.tree_map(np.testing.assert_allclose, unravel(flat), tree)
+
+
+@pytest.mark.parametrize(
+    "tree, isreal, iscomplex",
+    [
+        ({}, False, False),
+        ({"a": jnp.ones(2), "b": 1.0}, True, False),
+        ({"a": jnp.ones(2) + 1.0j, "b": 1.0j}, False, True),
+        ({"a": jnp.ones(2), "b": (1.0, 1.0j)}, True, True),
+    ],
+)
+def test_tree_leaf_dtypes(tree, isreal, iscomplex):
+    assert nk.jax.tree_leaf_isreal(tree) == isreal
+    assert nk.jax.tree_leaf_iscomplex(tree) == iscomplex
+    assert nk.jax.tree_ishomogeneous(tree) == (not (isreal and iscomplex))
+
+
+def test_tree_dot():
+    a = {"a": jnp.arange(3.0) + 1.0j, "b": (jnp.ones((2, 2)), 2.0)}
+    b = {"a": jnp.arange(3.0) * 2.0j, "b": (3 * jnp.ones((2, 2)), 1.5)}
+
+    expected = sum(
+        np.sum(np.asarray(x) * np.asarray(y))
+        for x, y in zip(jax.tree_util.tree_leaves(a), jax.tree_util.tree_leaves(b))
+    )
+    np.testing.assert_allclose(nk.jax.tree_dot(a, b), expected)
+
+    with pytest.raises(ValueError):
+        nk.jax.tree_dot(a, {"a": jnp.ones(3)})
+
+    # float32 leaves are contracted at full precision, and not at the reduced
+    # (bfloat16 or tf32) default matmul precision of some accelerators
+    rng = np.random.default_rng(1234)
+    x = {"a": 1.0 + 1e-3 * rng.random(100), "b": 1.0 + 1e-3 * rng.random((10, 10))}
+    y = {"a": 1.0 + 1e-3 * rng.random(100), "b": 1.0 + 1e-3 * rng.random((10, 10))}
+    expected = sum(np.sum(x[k] * y[k]) for k in x)
+    x32 = jax.tree_util.tree_map(lambda v: jnp.asarray(v, dtype=jnp.float32), x)
+    y32 = jax.tree_util.tree_map(lambda v: jnp.asarray(v, dtype=jnp.float32), y)
+    np.testing.assert_allclose(nk.jax.tree_dot(x32, y32), expected, rtol=1e-6)
+
+
+def test_tree_conj_cast():
+    tree_c = {"a": jnp.arange(3.0) + 1.0j, "b": jnp.ones(2)}
+    tree_r = {"a": jnp.arange(3.0), "b": jnp.ones(2)}
+
+    np.testing.assert_allclose(nk.jax.tree_conj(tree_c)["a"], jnp.arange(3.0) - 1.0j)
+    assert nk.jax.tree_conj(tree_r) is tree_r
+    assert isinstance(nk.jax.tree_conj({"a": np.ones(2)})["a"], jax.Array)
+
+    cast = nk.jax.tree_cast(tree_c, tree_r)
+    assert cast["a"].dtype == tree_r["a"].dtype
+    np.testing.assert_allclose(cast["a"], jnp.arange(3.0))
+    assert nk.jax.tree_cast(tree_r, tree_r) is tree_r
+    tree_np = {"a": np.ones(2)}
+    assert isinstance(nk.jax.tree_cast(tree_np, tree_np)["a"], jax.Array)
+    assert nk.jax.tree_cast(tree_r, tree_c)["a"].dtype == tree_c["a"].dtype
+
+
+def test_compose():
+    f = nk.jax.compose(lambda x: x + 1, lambda x: 2 * x, lambda x, y=0: x - y)
+    assert f(3, y=1) == 5
+    assert nk.jax.compose(abs)(-2) == 2
+
+
+def test_tree_ravel_unravel_dtypes():
+    tree = {"a": jnp.ones(3), "b": jnp.ones(2, dtype=jnp.float32)}
+    flat, unravel = nk.jax.tree_ravel(tree)
+
+    # a complex vector keeps its imaginary part in a real tree
+    res = unravel(flat * (1 + 0.5j))
+    assert res["a"].dtype == jnp.complex128
+    assert res["b"].dtype == jnp.complex64
+
+    # the real leaves of a complex tree only keep the real part
+    tree["c"] = jnp.ones(2) + 1.0j
+    flat, unravel = nk.jax.tree_ravel(tree)
+    res = unravel(flat * 1.0j)
+    assert res["a"].dtype == jnp.float64
+    np.testing.assert_allclose(res["a"], 0.0)
+    np.testing.assert_allclose(res["c"], (jnp.ones(2) + 1.0j) * 1.0j)
@@ -1,6 +1,7 @@
 import pytest
 
 import glob
+import struct
 
 import netket as nk
 from jax.nn.initializers import normal
@@ -11,6 +12,32 @@ from .. import common
 pytestmark = common.skipif_mpi
 
 
+def read_scalars(path):
+    """
+    Returns a dictionary mapping every tag to the list of (step, value) pairs
+    logged in the event files in path.
+    """
+    from tensorboardX.proto import event_pb2
+
+    scalars = {}
+    for fname in sorted(glob.glob(f"{path}/events.*")):
+        with open(fname, "rb") as f:
+            buffer = f.read()
+
+        # records are stored as length, crc of length, data, crc of data
+        pos = 0
+        while pos < len(buffer):
+            (length,) = struct.unpack("<Q", buffer[pos : pos + 8])
+            event = event_pb2.Event.FromString(buffer[pos + 12 : pos + 12 + length])
+            pos += 12 + length + 4
+
+            for value in event.summary.value:
+                scalars.setdefault(value.tag, []).append(
+                    (event.step, value.simple_value)
+                )
+    return scalars
+
+
 @pytest.fixture()
 def vstate(request):
     N = 8
@@ -38,13 +65,28 @@ def test_tblog(vstate, tmp_path):
     log = nk.logging.TensorBoardLog(path)
 
     for i in range(10):
-        log(i, {"Energy": jnp.array(1.0), "complex": jnp.array(1.0 + 1j)}, vstate)
-
-    log.flush()
+        log(
+            i,
+            {
+                "Energy": 1.0 * i,
+                "complex": 1.0 + 1j * i,
+                "jax": jnp.array(2.0 * i),
+                "jax_complex": jnp.array(1.0 + 3j * i),
+            },
+            vstate,
+        )
+
+    # closing the writer waits for its thread to write all the events to disk
+    log._writer.close()
     del log
 
-    files = glob.glob(f"{path}/*")
-    assert files
+    scalars = read_scalars(path)
+    steps = list(range(10))
+    assert scalars["Energy"] == [(i, 1.0 * i) for i in steps]
+    assert scalars["complex/im"] == [(i, 1.0 * i) for i in steps]
+    assert scalars["jax"] == [(i, 2.0 * i) for i in steps]
+    assert scalars["jax_complex/re"] == [(i, 1.0) for i in steps]
+    assert scalars["jax_complex/im"] == [(i, 3.0 * i) for i in steps]
 
 
 def test_lazy_init(tmp_path):
@@ -57,3 +99,28 @@ def test_lazy_init(tmp_path):
 
     files = glob.glob(f"{path}/*")
     assert not files
+
+
+def test_tblog_batch(vstate, tmp_path):
+    # skip test if tensorboardX not installed
+    pytest.importorskip("tensorboardX")
+
+    path = f"{str(tmp_path)}/dir1"
+
+    log = nk.logging.TensorBoardLog(path)
+    steps = list(range(0, 20, 2))
+    items = [{"Energy": 1.0 * i, "complex": 1.0 + 1j * i} for i in range(10)]
+    log.log_batch(steps, items, vstate)
+    assert log._old_step == 18
+
+    with pytest.raises(ValueError, match="one item for every step"):
+        log.log_batch(range(3), items)
+
+    # closing the writer waits for its thread to write all the events to disk
+    log._writer.close()
+    del log
+
+    scalars = read_scalars(path)
+    assert scalars["Energy"] == [(2 * i, 1.0 * i) for i in range(10)]
+    assert scalars["complex/re"] == [(2 * i, 1.0) for i in range(10)]
+    assert scalars["complex/im"] == [(2 * i, 1.0 * i) for i in range(10)]
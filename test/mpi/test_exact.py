@@ -0,0 +1,63 @@
+# Copyright 2023 The NetKet Authors - All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+import netket as nk
+
+from .. import common
+
+
+g = nk.graph.Chain(9)
+hi = nk.hilbert.Spin(s=1 / 2, N=g.n_nodes)
+operators = {
+    "Ising": nk.operator.Ising(hi, graph=g, h=1.0),
+    "Ising complex": nk.operator.Ising(hi, graph=g, h=1.0)
+    + 0.3 * sum(nk.operator.spin.sigmay(hi, i) for i in range(hi.size)),
+    "Heisenberg constrained": nk.operator.Heisenberg(
+        nk.hilbert.Spin(s=1 / 2, N=8, total_sz=0), graph=nk.graph.Chain(8)
+    ),
+    "BoseHubbard constrained": nk.operator.BoseHubbard(
+        nk.hilbert.Fock(n_max=3, N=4, n_particles=3), graph=nk.graph.Chain(4), U=1.0
+    ),
+}
+
+
+@common.onlyif_mpi
+@pytest.mark.parametrize(
+    "ha", [pytest.param(op, id=name) for name, op in operators.items()]
+)
+def test_row_distributed_operator(ha, _mpi_comm):
+    from netket.exact import _mpi_row_distributed_operator
+
+    A = _mpi_row_distributed_operator(ha)
+
+    x = _mpi_comm.bcast(np.random.rand(A.shape[0]))
+    np.testing.assert_allclose(A @ x, ha.to_sparse() @ x, rtol=1e-12)
+
+
+@common.onlyif_mpi
+@pytest.mark.parametrize(
+    "ha", [pytest.param(op, id=name) for name, op in operators.items()]
+)
+def test_lanczos_ed_distributed(ha):
+    w_ref = np.linalg.eigvalsh(ha.to_dense())[:3]
+
+    w = nk.exact.lanczos_ed(ha, k=3, distributed=True)
+    np.testing.assert_allclose(w, w_ref, rtol=1e-10)
+
+    w, v = nk.exact.lanczos_ed(ha, k=3, compute_eigenvectors=True, distributed=True)
+    np.testing.assert_allclose(w, w_ref, rtol=1e-10)
+    np.testing.assert_allclose(np.vdot(v[:, 0], ha.to_sparse() @ v[:, 0]), w[0])
@@ -53,8 +53,6 @@ def _setup(useExactSampler=True):
     ],
 )
 def test_MCState(useExactSampler):
-    pytest.importorskip("qutip")
-
     vs, vs_exact, S2, subsys = _setup(useExactSampler)
     S2_stats = vs.expect(S2)
     S2_exact = _renyi2_exact(vs, subsys)
@@ -66,8 +64,6 @@ def test_MCState(useExactSampler):
 
 
 def test_FullSumState():
-    pytest.importorskip("qutip")
-
     vs, vs_exact, S2, subsys = _setup()
     S2_stats = vs_exact.expect(S2)
     S2_exact = _renyi2_exact(vs_exact, subsys)
@@ -78,9 +74,20 @@ def test_FullSumState():
     np.testing.assert_allclose(S2_exact, S2_mean.real, atol=err)
 
 
-def test_continuous():
-    pytest.importorskip("qutip")
+def test_FullSumState_unsorted_partition():
+    vs, vs_exact, _, _ = _setup()
+    hi = vs_exact.hilbert
+
+    S2 = nkx.observable.Renyi2EntanglementEntropy(hi, [2, 0, 0])
+    np.testing.assert_equal(S2.partition, [0, 2])
+
+    S2_mean = vs_exact.expect(S2).mean
+    S2_exact = _renyi2_exact(vs_exact, [0, 2])
 
+    np.testing.assert_allclose(S2_exact, S2_mean.real, atol=1e-12)
+
+
+def test_continuous():
     N = 3
     hi = nk.hilbert.Particle(N, L=0, pbc=True)
     subsys = [0, 1]
@@ -95,8 +102,6 @@ def test_continuous():
 
 
 def test_invalid_partition():
-    pytest.importorskip("qutip")
-
     N = 3
     hi = nk.hilbert.Spin(0.5, N)
     subsys = [-1, 0]
@@ -114,8 +119,6 @@ def test_invalid_partition():
     nk.config.netket_experimental_sharding, reason="Only run without sharding"
 )
 def test_oddchains():
-    pytest.importorskip("qutip")
-
     vs, vs_exact, S2, subsys = _setup()
 
     N = 3
@@ -262,6 +262,46 @@ def test_states_in_hilbert(sampler, model_and_weights):
     #    assert np.min(sampler.acceptance) >= 0 and np.max(sampler.acceptance) <= 1.0
 
 
+def test_samples_generator(sampler, model_and_weights):
+    hi = sampler.hilbert
+    ma, w = model_and_weights(hi, sampler)
+
+    samples = list(sampler.samples(ma, w, chain_length=10, block_size=4))
+    assert len(samples) == 10
+    for sample in samples:
+        assert sample.shape == (sampler.n_chains, hi.size)
+
+    with pytest.raises(ValueError, match="block_size"):
+        list(sampler.samples(ma, w, chain_length=10, block_size=0))
+
+
+@pytest.mark.parametrize(
+    "sampler_type", [nk.sampler.MetropolisLocal, nk.sampler.MetropolisLocalNumpy]
+)
+@pytest.mark.parametrize("chain_length", [1, 8, 10])
+def test_samples_generator_chain(sampler_type, chain_length, model_and_weights):
+    # the blocks continue the chain exactly, including a shorter last block
+    hi = nk.hilbert.Spin(s=0.5, N=4)
+    sampler = sampler_type(hi)
+    ma, w = model_and_weights(hi, sampler)
+
+    # the state of the numpy sampler is mutated in place, so every chain starts
+    # from a new state with the same seed
+    def new_state():
+        return sampler.reset(ma, w, sampler.init_state(ma, w, seed=SAMPLER_SEED))
+
+    samples = np.stack(
+        list(
+            sampler.samples(
+                ma, w, state=new_state(), chain_length=chain_length, block_size=4
+            )
+        ),
+        axis=1,
+    )
+    expected, _ = sampler.sample(ma, w, state=new_state(), chain_length=chain_length)
+    np.testing.assert_array_equal(samples, expected)
+
+
 def findrng(rng):
     if hasattr(rng, "_bit_generator"):
         return rng._bit_generator.state["state"]
@@ -523,3 +563,43 @@ def test_exact_sampler(sampler):
     else:
         assert sampler.is_exact is False
         assert sampler.n_chains == 16 * mpi.n_nodes * device_count_per_rank()
+
+
+def test_log_pdf_hash(model_and_weights):
+    hi = nk.hilbert.Spin(s=0.5, N=4)
+    sampler = nk.sampler.MetropolisLocal(hi)
+    ma, w = model_and_weights(hi)
+
+    log_pdf = sampler.log_pdf(ma)
+    assert log_pdf == sampler.log_pdf(ma)
+    assert hash(log_pdf) == hash(sampler.log_pdf(ma))
+
+    # samplers with a different power must not share the compiled log-pdf
+    log_pdf_1 = sampler.replace(machine_pow=1).log_pdf(ma)
+    assert log_pdf != log_pdf_1
+
+    σ = hi.all_states()
+    np.testing.assert_allclose(log_pdf(w, σ), 2 * log_pdf_1(w, σ))
+
+
+def test_sampler_no_dynamic_leaves():
+    # samplers without array data are entirely static, and jitted functions
+    # taking them as arguments are cached on their static configuration
+    hi = nk.hilbert.Spin(s=0.5, N=4)
+    for sampler in [
+        nk.sampler.ExactSampler(hi),
+        nk.sampler.MetropolisLocal(hi, machine_pow=1),
+        nk.sampler.ARDirectSampler(hi),
+    ]:
+        leaves, treedef = jax.tree_util.tree_flatten(sampler)
+        assert leaves == []
+        sampler2 = jax.tree_util.tree_unflatten(treedef, leaves)
+        assert sampler2.machine_pow == sampler.machine_pow
+
+
+def test_sampler_eq_hash(sampler):
+    sampler2 = jax.tree_util.tree_map(lambda x: x, sampler)
+    assert sampler2 is not sampler
+    assert sampler2 == sampler
+    assert hash(sampler2) == hash(sampler)
+    assert sampler.replace(machine_pow=3) != sampler